@@ -0,0 +1,45 @@
+"""Employee search trigram indexes (PostgreSQL only)
+
+Revision ID: d5a8c3e7f2b9
+Revises: c2d9f4a6e1b0
+Create Date: 2026-10-18 13:20:45.671302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8c3e7f2b9'
+down_revision: Union[str, None] = 'c2d9f4a6e1b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) backing ILIKE '%term%' employee search
+TRIGRAM_INDEXES = [
+    ('ix_users_full_name_trgm', 'users', 'full_name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_employees_employee_id_trgm', 'employees', 'employee_id'),
+]
+
+
+def upgrade() -> None:
+    # Other databases search through the in-process index instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name, table, [column], unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table)
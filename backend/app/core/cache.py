@@ -0,0 +1,119 @@
+"""In-process caching helpers and data version counters.
+
+Every committed write bumps the version of the resource families whose
+tables it touched, so cached reads can key on the version instead of
+expiring on a timer. Versions and caches are per process (per worker).
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from app.core.executors import on_event_loop
+
+# Table name -> resource family whose version a write to it bumps
+TABLE_FAMILIES = {
+    "attendance": "attendance",
+    "attendance_daily_rollup": "attendance",
+    "employees": "employees",
+    "users": "employees",
+    "departments": "departments",
+    "positions": "positions",
+}
+
+_versions = defaultdict(int)
+_versions_lock = threading.Lock()
+_version_listeners = []
+
+
+def get_version(family: str) -> int:
+    """Current data version of a resource family."""
+    return _versions[family]
+
+
+def bump_versions(*families: str):
+    """Mark resource families as changed and notify listeners."""
+    with _versions_lock:
+        for family in families:
+            _versions[family] += 1
+    if families:
+        for listener in list(_version_listeners):
+            listener(set(families))
+
+
+def add_version_listener(listener):
+    """Call ``listener(families)`` after every version bump."""
+    _version_listeners.append(listener)
+
+
+def tables_to_families(table_names) -> set:
+    """Resource families affected by writes to the given tables."""
+    return {TABLE_FAMILIES[name] for name in table_names if name in TABLE_FAMILIES}
+
+
+class LRUCache:
+    """Thread-safe, size-bounded mapping that evicts the least recently used key."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TTLCache(LRUCache):
+    """LRUCache whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self._compute_lock = threading.Lock()
+
+    def get(self, key, default=None):
+        entry = super().get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key, value):
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+    def get_or_set(self, key, compute):
+        """Return the cached value or compute it once, even under concurrent misses.
+
+        On the event loop (async engine mode) concurrent misses each compute:
+        a thread lock held across the query would stall the loop.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        if on_event_loop():
+            value = compute()
+            self.set(key, value)
+            return value
+        with self._compute_lock:
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self.set(key, value)
+            return value
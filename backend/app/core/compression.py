@@ -0,0 +1,206 @@
+"""Negotiated response compression (zstd, brotli, gzip).
+
+gzip is always available; brotli and zstd are used when the ``brotli`` /
+``zstandard`` packages are installed. The codec is picked from the client's
+Accept-Encoding, preferring zstd, then brotli, then gzip. Bodies under
+COMPRESSION_MIN_SIZE are sent as is, streamed responses are compressed chunk
+by chunk (each chunk flushed, so nothing is held back), and chunks or bodies
+of COMPRESSION_OFFLOAD_SIZE or more are compressed on a worker thread.
+"""
+import zlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml",
+)
+
+
+class GzipEncoder:
+    DEFAULT_LEVEL = 6  # zlib's default
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+class BrotliEncoder:
+    DEFAULT_LEVEL = 5  # brotli's own default (11) is meant for static assets
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class ZstdEncoder:
+    DEFAULT_LEVEL = 3  # zstd's default
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.compress(data)
+        if final:
+            return output + self._compressor.flush()
+        return output + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+# Content-Encoding -> encoder class, most preferred first
+ENCODERS = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+ENCODERS["gzip"] = GzipEncoder
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """The available codec the client ranks highest (our preference on ties), or None."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in ENCODERS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        # Ties go to the earlier (preferred) codec
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compression_level(path: str, encoding: str) -> int:
+    """Level for ``encoding`` on ``path``: the longest matching COMPRESSION_ROUTE_LEVELS prefix, else
+    COMPRESSION_LEVELS, else the codec's DEFAULT_LEVEL."""
+    levels = settings.COMPRESSION_LEVELS
+    best = ""
+    for prefix, route_levels in settings.COMPRESSION_ROUTE_LEVELS.items():
+        if path.startswith(prefix) and len(prefix) > len(best) and encoding in route_levels:
+            best, levels = prefix, route_levels
+    return levels.get(encoding, ENCODERS[encoding].DEFAULT_LEVEL)
+
+
+class CompressionMiddleware:
+    """Compress responses with the codec negotiated from Accept-Encoding (see module docstring)."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+        offload_size: int = settings.COMPRESSION_OFFLOAD_SIZE
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(
+            send, encoding, compression_level(scope["path"], encoding), self.minimum_size, self.offload_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send, encoding: str, level: int, minimum_size: int, offload_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.start_message = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def _encode(self, data: bytes, final: bool) -> bytes:
+        if len(data) >= self.offload_size:
+            return await run_in_threadpool(self.encoder.encode, data, final)
+        return self.encoder.encode(data, final)
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message.get("headers", []))
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or message["status"] < 200 or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                self.passthrough = True
+                await self._send(message)
+            else:
+                # Wait for the first body chunk to see if the response is worth compressing
+                self.start_message = message
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            start["headers"] = list(start.get("headers", []))
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            self.encoder = ENCODERS[self.encoding](self.level)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and etag.endswith('"') and not etag.startswith("W/"):
+                # A strong ETag must differ between encodings of the same resource
+                headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+            if more_body:
+                del headers["Content-Length"]
+                await self._send(start)
+            else:
+                body = await self._encode(body, final=True)
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+        await self._send({
+            "type": "http.response.body",
+            "body": await self._encode(body, final=not more_body),
+            "more_body": more_body,
+        })
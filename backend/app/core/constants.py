@@ -21,6 +21,18 @@ ATTENDANCE_STATUS = [
     ATTENDANCE_HALF_DAY,
 ]
 
+# Maximum rows accepted by the bulk attendance endpoint
+BULK_ATTENDANCE_MAX_ROWS = 10000
+
+# Maximum rows accepted by the bulk employee onboarding endpoint
+BULK_EMPLOYEE_MAX_ROWS = 10000
+
+# Initial password of employees created through the API or bulk onboarding
+DEFAULT_EMPLOYEE_PASSWORD = "password123"
+
+# Employee codes reserved per counter round trip on databases without sequences
+EMPLOYEE_CODE_BLOCK_SIZE = 50
+
 # Leave status
 LEAVE_PENDING = "pending"
 LEAVE_APPROVED = "approved"
@@ -0,0 +1,94 @@
+"""In-process change feed fanned out to streaming (SSE) clients."""
+import asyncio
+import threading
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+
+class ChangeFeed:
+    """Publish deltas of a snapshot to every subscriber when watched data changes.
+
+    ``producer`` is a blocking callable returning a flat dict snapshot. It runs
+    once per burst of changes (debounced), never per subscriber, and never
+    while nothing has changed, so idle subscribers cost no database work.
+    """
+
+    def __init__(
+        self,
+        producer: Callable[[], dict],
+        families: set,
+        debounce_seconds: float = 0.5,
+        queue_size: int = 16
+    ):
+        self.producer = producer
+        self.families = set(families)
+        self.debounce_seconds = debounce_seconds
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def notify(self, families):
+        """Signal that resource families changed; safe to call from any thread."""
+        if self._loop is None or not self.families.intersection(families):
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Event loop already closed
+            pass
+
+    async def snapshot(self) -> dict:
+        """Latest published snapshot, producing one if none exists yet."""
+        if self._snapshot is None:
+            self._snapshot = await run_in_threadpool(self.producer)
+        return self._snapshot
+
+    async def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber queue and start the publisher if needed."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is not loop:
+                self._loop = loop
+                self._wake = asyncio.Event()
+                self._task = None
+            if self._task is None or self._task.done():
+                self._task = loop.create_task(self._run())
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(self.debounce_seconds)
+            self._wake.clear()
+            if not self._subscribers:
+                self._snapshot = None
+                continue
+
+            previous = self._snapshot or {}
+            current = await run_in_threadpool(self.producer)
+            self._snapshot = current
+            delta = {key: value for key, value in current.items() if previous.get(key) != value}
+            if delta:
+                self._publish(delta)
+
+    def _publish(self, message: dict):
+        for queue in list(self._subscribers):
+            if queue.full():
+                # Slow client: fold its pending deltas into this one
+                merged = {}
+                while not queue.empty():
+                    merged.update(queue.get_nowait())
+                merged.update(message)
+                queue.put_nowait(merged)
+            else:
+                queue.put_nowait(message)
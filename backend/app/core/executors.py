@@ -0,0 +1,111 @@
+"""Dedicated, bounded executors for CPU-heavy work.
+
+Work sent here does not use Starlette's shared threadpool, so a burst of it
+(e.g. bcrypt during a login storm) cannot starve unrelated endpoints. Each
+executor admits at most ``max_workers + max_queue`` calls at once; beyond
+that new calls are rejected with 503 instead of piling up.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from sqlalchemy.util.concurrency import await_only
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+
+def on_event_loop() -> bool:
+    """Whether this is the event loop thread, i.e. sync code run from
+    ``AsyncSession.run_sync`` (async engine mode), which must not block."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class BoundedExecutor:
+    """Thread pool with a queue depth limit and queue-wait / run-time metrics."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.queue_wait = LatencyStats()
+        self.run_time = LatencyStats()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.name)
+        return self._pool
+
+    def submit(self, fn, *args) -> Future:
+        """Queue ``fn(*args)``; raises 503 when the executor is saturated."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        queued_at = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            self.queue_wait.observe(started - queued_at)
+            try:
+                return fn(*args)
+            finally:
+                self.run_time.observe(time.perf_counter() - started)
+                with self._lock:
+                    self._in_flight -= 1
+
+        try:
+            return self._get_pool().submit(task)
+        except RuntimeError:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    def call(self, fn, *args):
+        """Run ``fn(*args)`` on the executor and block until it finishes.
+
+        Inside ``AsyncSession.run_sync`` the wait is handed back to the event
+        loop instead of blocking it.
+        """
+        if on_event_loop():
+            return await_only(self.run(fn, *args))
+        return self.submit(fn, *args).result()
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` on the executor without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "run_time": self.run_time.snapshot(),
+        }
+
+
+# bcrypt hashing and verification (see app.core.security)
+password_executor = BoundedExecutor(
+    "password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,76 @@
+"""Conditional GETs from data versions.
+
+Routes declare the resource families they read with
+``dependencies=[Depends(conditional_get(...))]``. The dependency derives a
+strong ETag from those families' data versions (see app.core.cache) and the
+request URL. It runs before the route touches the database, so an
+``If-None-Match`` hit is answered with 304 without a query.
+
+Versions are per process. The tag therefore includes this worker's boot id,
+so a worker only confirms tags it issued itself. It also includes the
+current ETAG_MAX_AGE_SECONDS window: a write made by another worker (or a
+CLI) can go unnoticed by a 304 for up to that long, so keep it short.
+"""
+import hashlib
+import time
+import uuid
+from datetime import date
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.cache import get_version
+from app.core.config import settings
+
+_boot_id = uuid.uuid4().hex
+
+# Suffixes the compression middleware appends to strong ETags
+_ENCODING_SUFFIXES = ("-gzip", "-br", "-zstd")
+
+
+def data_etag(families, *parts) -> str:
+    """Strong ETag for a response built from ``families`` (plus any extra ``parts``)."""
+    window = int(time.time() // settings.ETAG_MAX_AGE_SECONDS) if settings.ETAG_MAX_AGE_SECONDS > 0 else 0
+    key = "|".join([_boot_id, str(window), *(f"{family}:{get_version(family)}" for family in families), *map(str, parts)])
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison, any encoding suffix)."""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        for suffix in _ENCODING_SUFFIXES:
+            if candidate.endswith(suffix + '"'):
+                candidate = candidate[:-len(suffix) - 1] + '"'
+                break
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_control_for(path: str) -> str:
+    """Cache-Control for ``path``: the longest matching CACHE_CONTROL prefix, else CACHE_CONTROL_DEFAULT."""
+    best, policy = "", settings.CACHE_CONTROL_DEFAULT
+    for prefix, route_policy in settings.CACHE_CONTROL.items():
+        if path.startswith(prefix) and len(prefix) > len(best):
+            best, policy = prefix, route_policy
+    return policy
+
+
+def conditional_get(*families: str):
+    """Dependency answering If-None-Match with 304 and tagging fresh responses.
+
+    Responses also depend on the date, since some views default to today.
+    """
+    def check(request: Request, response: Response):
+        etag = data_etag(families, request.url.path, request.url.query, date.today())
+        headers = {"ETag": etag, "Cache-Control": cache_control_for(request.url.path)}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return check
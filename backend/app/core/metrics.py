@@ -0,0 +1,58 @@
+"""Lightweight in-process metrics (per worker process)."""
+import bisect
+import threading
+from collections import deque
+from typing import Sequence
+
+
+class LatencyStats:
+    """Count / total / max of a timing plus percentiles over a recent window.
+
+    With ``buckets`` (ascending upper bounds in seconds) it also keeps an
+    all-time histogram of the observations.
+    """
+
+    def __init__(self, window: int = 1024, buckets: Sequence[float] = ()):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self._bucket_counts = [0] * (len(self.buckets) + 1) if self.buckets else []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            if self.buckets:
+                self._bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def histogram(self) -> dict:
+        """Observations per bucket, keyed by upper bound in ms ("+Inf" for the rest)."""
+        labels = [f"{bound * 1000:g}" for bound in self.buckets] + ["+Inf"]
+        with self._lock:
+            return dict(zip(labels, self._bucket_counts))
+
+    def snapshot(self) -> dict:
+        """Summary in milliseconds."""
+        summary = {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+        if self.buckets:
+            summary["histogram_ms"] = self.histogram()
+        return summary
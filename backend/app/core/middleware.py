@@ -0,0 +1,78 @@
+"""ASGI middleware."""
+import logging
+import time
+
+from app.core.config import settings
+from app.db.database import PRIMARY_COOKIE
+from app.db.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class ReadYourWritesMiddleware:
+    """Mark clients that just wrote, so their reads skip the replica for a while.
+
+    After a request that committed a write, sets a short-lived cookie that
+    get_read_db / get_read_database honour (see use_replica) on any worker.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and state.get("db_wrote"):
+                window = settings.READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + window:.0f}; Max-Age={window}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+class QueryInstrumentationMiddleware:
+    """Report each request's SQL statements (see app/db/query_stats.py).
+
+    Adds ``Server-Timing: db;dur=<ms>`` and ``X-DB-Queries`` headers covering
+    the statements run before the response started, and logs a warning when
+    one statement shape repeats more than SQL_REPEAT_WARNING_THRESHOLD times
+    over the whole request (typically an N+1 query).
+    """
+
+    def __init__(self, app, threshold: int = settings.SQL_REPEAT_WARNING_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    (b"server-timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode()),
+                    (b"x-db-queries", str(stats.count).encode()),
+                ]
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            for statement, runs in stats.repeated(self.threshold):
+                logger.warning(
+                    "%s %s ran the same statement %d times (possible N+1): %s",
+                    scope["method"], scope["path"], runs, " ".join(statement.split())[:300]
+                )
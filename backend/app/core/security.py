@@ -1,27 +1,68 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.cache import LRUCache
+from app.core.executors import password_executor
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib and jose (with its crypto backend) are imported on first use rather
+# than at startup, which keeps serverless cold starts short
+_pwd_context = None
+
+
+def get_pwd_context():
+    """Password hashing context (passlib CryptContext), created on first use."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+    return _pwd_context
 
 # Security scheme
 security = HTTPBearer()
 
+# Claims of verified access tokens keyed by token digest; each entry is only
+# used until the token's own exp
+_verified_tokens = LRUCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    """Hash a password using bcrypt (on the password executor)."""
+    return password_executor.call(get_pwd_context().hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (on the password executor)."""
+    return password_executor.call(get_pwd_context().verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """Verify a password; returns (valid, new_hash).
+
+    ``new_hash`` is set when the stored hash needs an update (e.g. it was made
+    with a different bcrypt cost than BCRYPT_ROUNDS) and should be saved.
+    """
+    return password_executor.call(get_pwd_context().verify_and_update, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    """verify_and_update_password for async routes."""
+    return await password_executor.run(get_pwd_context().verify_and_update, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password for async routes; does not hold a threadpool thread."""
+    return await password_executor.run(get_pwd_context().hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async routes; does not hold a threadpool thread."""
+    return await password_executor.run(get_pwd_context().verify, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -34,6 +75,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode.update({"exp": expire})
+    from jose import jwt
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -41,13 +83,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create a JWT refresh token."""
+    """Create a JWT refresh token with a unique ``jti`` (used for revocation)."""
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    from jose import jwt
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -55,17 +98,29 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
 
 
 def verify_token(token: str) -> dict:
-    """Verify and decode a JWT token."""
+    """Verify and decode a JWT token.
+
+    Tokens already verified by this process are answered from memory until
+    they expire, skipping the signature check.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _verified_tokens.get(key)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    expires_at = payload.get("exp")
+    if settings.TOKEN_CACHE_SIZE > 0 and isinstance(expires_at, (int, float)):
+        _verified_tokens.set(key, (expires_at, payload))
+    return payload
 
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
@@ -0,0 +1,87 @@
+"""Fast JSON for large list responses.
+
+With ``response_model`` FastAPI validates every row into a pydantic model,
+converts the models back to plain data and only then encodes JSON; for
+1,000-row pages that dominates the request. RowSerializer derives TypedDicts
+from the response models once, and their TypeAdapter dumps row dicts (or
+SQLAlchemy rows) straight to JSON bytes inside pydantic-core, with the same
+fields, defaults and formatting as the models but no model instance per row.
+
+Rows are trusted to already have the declared types (they come from our own
+queries), so nothing is validated; pydantic warns if a value does not fit.
+"""
+import typing
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+from typing_extensions import TypedDict
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+else:
+    from fastapi.responses import JSONResponse as FastJSONResponse
+
+
+def _row_type(annotation) -> Tuple[Any, Optional[Callable]]:
+    """TypedDict equivalent of ``annotation`` and a function filling model defaults (None if not needed)."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _model_row_type(annotation)
+    origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        item_type, fill_item = _row_type(typing.get_args(annotation)[0])
+        fill = (lambda items: [fill_item(item) for item in items]) if fill_item else None
+        return List[item_type], fill
+    if origin is Union:
+        converted = [_row_type(arg) for arg in typing.get_args(annotation)]
+        fills = [fill for _, fill in converted if fill]
+        if len(fills) > 1:
+            raise TypeError(f"Unsupported union of models: {annotation}")
+        fill = (lambda value: None if value is None else fills[0](value)) if fills else None
+        return Union[tuple(row_type for row_type, _ in converted)], fill
+    return annotation, None
+
+
+_model_row_types = {}
+
+
+def _model_row_type(model):
+    if model not in _model_row_types:
+        fields, defaults, nested = {}, {}, {}
+        for name, field in model.model_fields.items():
+            fields[name], fill = _row_type(field.annotation)
+            if fill:
+                nested[name] = fill
+            if field.default is not PydanticUndefined:
+                defaults[name] = field.default
+
+        def fill(row):
+            row = {**defaults, **(row._mapping if hasattr(row, "_mapping") else row)}
+            for name, fill_nested in nested.items():
+                if name in row:
+                    row[name] = fill_nested(row[name])
+            return row
+
+        _model_row_types[model] = (TypedDict(f"{model.__name__}Row", fields), fill)
+    return _model_row_types[model]
+
+
+class RowSerializer:
+    """Serializes data shaped like ``annotation`` (e.g. a response model) to JSON bytes."""
+
+    def __init__(self, annotation):
+        row_type, self._fill = _row_type(annotation)
+        self.adapter = TypeAdapter(row_type)
+
+    def dump_json(self, value) -> bytes:
+        return self.adapter.dump_json(self._fill(value) if self._fill else value)
+
+    def response(self, value, **kwargs) -> Response:
+        """A JSON response for ``value``; FastAPI skips response_model handling for it."""
+        return Response(self.dump_json(value), media_type="application/json", **kwargs)
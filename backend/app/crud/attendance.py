@@ -0,0 +1,367 @@
+from fastapi import HTTPException, status as status_codes
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_, func
+from collections import Counter
+from datetime import date, datetime
+from typing import List, Optional
+
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.schemas.attendance import MarkAttendancePayload, UpdateAttendancePayload
+from app.crud.attendance_rollup import (
+    apply_rollup_deltas, employee_departments, record_attendance_change, rollup_key
+)
+from app.crud.employee import employee_detail_columns, join_employee_details
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.constants import ATTENDANCE_STATUS
+
+
+def attendance_to_dict(attendance: Attendance, employee: Optional[dict] = None) -> dict:
+    """Build an AttendanceResponse-shaped dict from an attendance row."""
+    return {
+        "id": attendance.id,
+        "employee_id": attendance.employee_id,
+        "date": attendance.date,
+        "status": attendance.status,
+        "check_in_time": attendance.check_in_time,
+        "check_out_time": attendance.check_out_time,
+        "notes": attendance.notes,
+        "created_at": attendance.created_at,
+        "updated_at": attendance.updated_at,
+        "employee": employee
+    }
+
+
+def get_attendance(db: Session, attendance_id: int) -> Optional[Attendance]:
+    """Get an attendance record with its employee loaded."""
+    return db.query(Attendance).options(joinedload(Attendance.employee))\
+        .filter(Attendance.id == attendance_id).first()
+
+
+def mark_attendance(db: Session, data: MarkAttendancePayload) -> Attendance:
+    """Log one employee's attendance for a day."""
+    existing = db.query(Attendance).filter(
+        Attendance.employee_id == data.employee_id, 
+        Attendance.date == data.date
+    ).first()
+    
+    if existing:
+        raise HTTPException(status_code=400, detail="Attendance for this date already logged")
+        
+    new_attendance = Attendance(**data.dict())
+    db.add(new_attendance)
+    record_attendance_change(db, new=(data.employee_id, data.date, data.status))
+    db.commit()
+    return get_attendance(db, new_attendance.id)
+
+
+def update_attendance(db: Session, attendance_id: int, data: UpdateAttendancePayload) -> Optional[Attendance]:
+    """Update an attendance record, keeping the daily rollup in step."""
+    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    if not attendance:
+        return None
+        
+    previous = (attendance.employee_id, attendance.date, attendance.status)
+    update_data = data.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(attendance, key, value)
+        
+    db.add(attendance)
+    current = (attendance.employee_id, attendance.date, attendance.status)
+    if current != previous:
+        record_attendance_change(db, old=previous, new=current)
+    db.commit()
+    return get_attendance(db, attendance_id)
+
+
+def get_employee_attendance_history(db: Session, employee_id: int, start_date: date, end_date: date) -> List[Attendance]:
+    """An employee's attendance records between two dates."""
+    return db.query(Attendance).options(joinedload(Attendance.employee)).filter(
+        Attendance.employee_id == employee_id,
+        Attendance.date >= start_date,
+        Attendance.date <= end_date
+    ).all()
+
+
+def get_attendance_with_employees(
+    db: Session,
+    on_date: Optional[date] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    employee_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+):
+    """Get filtered attendance rows joined with employee details in one query.
+
+    Rows are ordered by (date, id) and paginated by keyset: ``cursor`` is the
+    opaque next-page cursor returned alongside the previous page. Returns the
+    page and the cursor for the next one (None on the last page).
+    """
+    query = join_employee_details(
+        db.query(Attendance, *employee_detail_columns())
+        .join(Employee, Attendance.employee_id == Employee.id)
+    )
+
+    if on_date:
+        query = query.filter(Attendance.date == on_date)
+    if start_date:
+        query = query.filter(Attendance.date >= start_date)
+    if end_date:
+        query = query.filter(Attendance.date <= end_date)
+    if employee_id:
+        query = query.filter(Attendance.employee_id == employee_id)
+    if status:
+        query = query.filter(Attendance.status == status)
+
+    after = decode_cursor(cursor)
+    if after:
+        try:
+            after_date, after_id = date.fromisoformat(after[0]), int(after[1])
+        except (ValueError, TypeError, IndexError):
+            raise HTTPException(status_code=status_codes.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.filter(or_(
+            Attendance.date > after_date,
+            and_(Attendance.date == after_date, Attendance.id > after_id)
+        ))
+
+    rows = query.order_by(Attendance.date, Attendance.id).limit(limit).all()
+
+    results = []
+    for row in rows:
+        employee = row._asdict()
+        attendance = employee.pop("Attendance")
+        results.append(attendance_to_dict(attendance, employee))
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = results[-1]
+        next_cursor = encode_cursor(last["date"].isoformat(), last["id"])
+    return results, next_cursor
+
+
+def iter_daily_roster(db: Session, on_date: date, chunk_size: int = 500):
+    """Yield every employee merged with their attendance for ``on_date``.
+
+    Employees are LEFT JOINed to that day's attendance in SQL and read through
+    a server-side cursor in chunks of ``chunk_size``, so memory stays flat
+    regardless of head count. Employees without a record are reported absent.
+    """
+    query = join_employee_details(
+        db.query(
+            *employee_detail_columns(),
+            Attendance.id.label("attendance_id"),
+            Attendance.status.label("attendance_status"),
+            Attendance.check_in_time,
+            Attendance.check_out_time,
+            Attendance.notes,
+            Attendance.created_at.label("attendance_created_at"),
+            Attendance.updated_at.label("attendance_updated_at")
+        )
+    ).outerjoin(
+        Attendance,
+        and_(Attendance.employee_id == Employee.id, Attendance.date == on_date)
+    ).order_by(Employee.id)
+
+    for row in query.yield_per(chunk_size):
+        employee = row._asdict()
+        attendance_id = employee.pop("attendance_id")
+        attendance_status = employee.pop("attendance_status")
+        record = {
+            "id": attendance_id,
+            "employee_id": employee["id"],
+            "date": on_date,
+            "status": attendance_status if attendance_id is not None else "absent",
+            "check_in_time": employee.pop("check_in_time"),
+            "check_out_time": employee.pop("check_out_time"),
+            "notes": employee.pop("notes"),
+            "created_at": employee.pop("attendance_created_at"),
+            "updated_at": employee.pop("attendance_updated_at"),
+        }
+        record["employee"] = employee
+        yield record
+
+
+def get_daily_roster(db: Session, on_date: date) -> list:
+    """All of iter_daily_roster() as a list."""
+    return list(iter_daily_roster(db, on_date))
+
+
+ATTENDANCE_UPSERT_COLUMNS = ("status", "check_in_time", "check_out_time", "notes")
+
+
+def _dialect_insert(dialect_name: str):
+    """The dialect's INSERT construct with ON CONFLICT support, or None."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _insert_new_statement(dialect_name: str):
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING the (employee_id, date) keys it created."""
+    insert = _dialect_insert(dialect_name)
+    if insert is None:
+        return None
+    table = Attendance.__table__
+    return insert(table).on_conflict_do_nothing(index_elements=["employee_id", "date"])\
+        .returning(table.c.employee_id, table.c.date)
+
+
+def _upsert_statement(dialect_name: str, merge_punches: bool = False):
+    """Build an INSERT ... ON CONFLICT (employee_id, date) DO UPDATE for the dialect.
+
+    With ``merge_punches`` a NULL check-in/check-out time or note in the new row
+    keeps the stored value instead of clearing it.
+    """
+    insert = _dialect_insert(dialect_name)
+    if insert is None:
+        return None
+
+    table = Attendance.__table__
+    stmt = insert(table)
+    set_ = {column: stmt.excluded[column] for column in ATTENDANCE_UPSERT_COLUMNS}
+    if merge_punches:
+        for column in ("check_in_time", "check_out_time", "notes"):
+            set_[column] = func.coalesce(stmt.excluded[column], table.c[column])
+    set_["updated_at"] = datetime.utcnow()
+    return stmt.on_conflict_do_update(index_elements=["employee_id", "date"], set_=set_)
+
+
+def existing_attendance_statuses(db: Session, rows: List[dict], lock: bool = False) -> dict:
+    """Map the (employee_id, date) pairs of ``rows`` that already exist to their status.
+
+    With ``lock`` the rows are read FOR UPDATE, so their status cannot change
+    before the caller's transaction ends.
+    """
+    if not rows:
+        return {}
+    keys = {(row["employee_id"], row["date"]) for row in rows}
+    employee_ids = {employee_id for employee_id, _ in keys}
+    dates = [day for _, day in keys]
+    query = db.query(Attendance.employee_id, Attendance.date, Attendance.status)\
+        .filter(Attendance.date >= min(dates), Attendance.date <= max(dates))
+    if len(employee_ids) <= 1000:
+        query = query.filter(Attendance.employee_id.in_(employee_ids))
+    if lock:
+        query = query.with_for_update()
+    return {
+        (row.employee_id, row.date): row.status
+        for row in query
+        if (row.employee_id, row.date) in keys
+    }
+
+
+def upsert_attendance_rows(
+    db: Session,
+    rows: List[dict],
+    merge_punches: bool = False,
+    departments: Optional[dict] = None
+) -> dict:
+    """Upsert attendance row dicts on ``unique_employee_date`` without committing.
+
+    Rows must not repeat an (employee_id, date) pair. Returns each row's key
+    mapped to the status it replaced, or None for rows that were created.
+
+    On PostgreSQL and SQLite new keys are inserted first with INSERT ... ON
+    CONFLICT DO NOTHING RETURNING, which reports exactly the rows this call
+    created. The rows of the remaining keys are then locked and their status
+    read before one INSERT ... ON CONFLICT DO UPDATE overwrites them. So the
+    outcomes and the daily rollup (adjusted in the same transaction) stay right
+    while concurrent writes touch the same keys. Other backends lock the
+    existing rows, then UPDATE-then-INSERT per row. ``departments`` (see
+    employee_departments) is fetched when not supplied.
+    """
+    if not rows:
+        return {}
+    if departments is None:
+        departments = employee_departments(db, {row["employee_id"] for row in rows})
+
+    dialect_name = db.get_bind().dialect.name
+    insert_new = _insert_new_statement(dialect_name)
+    if insert_new is not None:
+        created = {(row.employee_id, row.date) for row in db.execute(insert_new, rows)}
+        remaining = [row for row in rows if (row["employee_id"], row["date"]) not in created]
+        existing = existing_attendance_statuses(db, remaining, lock=True)
+        if remaining:
+            db.execute(_upsert_statement(dialect_name, merge_punches), remaining)
+    else:
+        existing = existing_attendance_statuses(db, rows, lock=True)
+        for row in rows:
+            values = {column: row.get(column) for column in ATTENDANCE_UPSERT_COLUMNS}
+            if merge_punches:
+                values = {
+                    column: value for column, value in values.items()
+                    if value is not None or column == "status"
+                }
+            updated = db.query(Attendance).filter(
+                Attendance.employee_id == row["employee_id"],
+                Attendance.date == row["date"]
+            ).update(values)
+            if not updated:
+                db.add(Attendance(**row))
+
+    previous = {}
+    deltas = Counter()
+    for row in rows:
+        key = (row["employee_id"], row["date"])
+        department_id = departments.get(row["employee_id"])
+        previous[key] = existing.get(key)
+        if previous[key] is not None:
+            deltas[rollup_key(row["date"], department_id, previous[key])] -= 1
+        deltas[rollup_key(row["date"], department_id, row["status"])] += 1
+
+    apply_rollup_deltas(db, deltas)
+    return previous
+
+
+def bulk_upsert_attendance(db: Session, records: List[MarkAttendancePayload]) -> dict:
+    """Insert or update many attendance rows in one statement.
+
+    Rows for unknown employees, with a status outside ATTENDANCE_STATUS, or
+    repeating an (employee_id, date) pair within the batch are rejected; every
+    other row is upserted on the ``unique_employee_date`` constraint. Whether
+    a row was created or updated comes from the upsert itself (see
+    upsert_attendance_rows).
+    """
+    departments = employee_departments(db, {record.employee_id for record in records})
+
+    results = []
+    rows = []
+    seen = set()
+    for index, record in enumerate(records):
+        key = (record.employee_id, record.date)
+        outcome, detail = None, None
+        if record.employee_id not in departments:
+            outcome, detail = "rejected", "Employee not found"
+        elif record.status not in ATTENDANCE_STATUS:
+            outcome, detail = "rejected", f"Unknown status '{record.status}'"
+        elif key in seen:
+            outcome, detail = "rejected", "Duplicate employee and date in request"
+        else:
+            seen.add(key)
+            rows.append(record.dict())
+        results.append({
+            "index": index,
+            "employee_id": record.employee_id,
+            "date": record.date,
+            "outcome": outcome,
+            "detail": detail
+        })
+
+    if rows:
+        previous = upsert_attendance_rows(db, rows, departments=departments)
+        db.commit()
+        for result in results:
+            if result["outcome"] is None:
+                key = (result["employee_id"], result["date"])
+                result["outcome"] = "updated" if previous[key] is not None else "created"
+
+    counts = {"created": 0, "updated": 0, "rejected": 0}
+    for result in results:
+        counts[result["outcome"]] += 1
+    return {**counts, "results": results}
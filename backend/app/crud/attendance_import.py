@@ -0,0 +1,138 @@
+"""Streaming CSV import for biometric / time-clock attendance exports."""
+import csv
+from datetime import date, time
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+from app.crud.attendance import upsert_attendance_rows
+from app.crud.attendance_rollup import employee_departments
+from app.core.constants import ATTENDANCE_PRESENT, ATTENDANCE_ABSENT, ATTENDANCE_STATUS
+
+# Header names accepted for the employee code column (EMP-xxx)
+EMPLOYEE_CODE_COLUMNS = ("employee_id", "employee_code", "badge", "badge_id")
+
+# Number of rejected rows reported back in full
+MAX_REPORTED_ERRORS = 100
+
+
+def load_employee_code_map(db: Session) -> dict:
+    """Map every employee code (upper-cased) to its internal id in one query."""
+    return {
+        code.upper(): employee_id
+        for employee_id, code in db.query(Employee.id, Employee.employee_id)
+    }
+
+
+def _parse_time(value: str) -> Optional[time]:
+    value = value.strip()
+    return time.fromisoformat(value) if value else None
+
+
+def parse_attendance_csv(
+    lines: Iterable[str],
+    employee_codes: dict
+) -> Iterator[tuple]:
+    """Parse CSV lines lazily into attendance rows.
+
+    Yields ``(line_number, row, error)`` per data line, where ``row`` is a dict
+    of Attendance column values or None when ``error`` explains the rejection.
+    """
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader, [])]
+    code_column = next((name for name in EMPLOYEE_CODE_COLUMNS if name in header), None)
+    if code_column is None or "date" not in header:
+        raise ValueError(
+            f"CSV must have a date column and one of: {', '.join(EMPLOYEE_CODE_COLUMNS)}"
+        )
+
+    def column(name):
+        return header.index(name) if name in header else None
+
+    code_idx, date_idx = column(code_column), column("date")
+    optional = [column(name) for name in ("check_in_time", "check_out_time", "status", "notes")]
+    width = max(idx for idx in [code_idx, date_idx, *optional] if idx is not None) + 1
+    check_in_idx, check_out_idx, status_idx, notes_idx = (
+        idx if idx is not None else width for idx in optional
+    )
+
+    for record in reader:
+        line_number = reader.line_num
+        if not record:
+            continue
+        record += [""] * (width + 1 - len(record))
+        code = record[code_idx].strip().upper()
+        employee_id = employee_codes.get(code)
+        if employee_id is None:
+            yield line_number, None, f"Unknown employee code '{code}'"
+            continue
+        try:
+            check_in_time = _parse_time(record[check_in_idx])
+            check_out_time = _parse_time(record[check_out_idx])
+            row = {
+                "employee_id": employee_id,
+                "date": date.fromisoformat(record[date_idx].strip()),
+                "check_in_time": check_in_time,
+                "check_out_time": check_out_time,
+                "notes": record[notes_idx].strip() or None,
+            }
+        except ValueError as e:
+            yield line_number, None, str(e)
+            continue
+
+        status = record[status_idx].strip().lower()
+        if not status:
+            status = ATTENDANCE_PRESENT if check_in_time or check_out_time else ATTENDANCE_ABSENT
+        elif status not in ATTENDANCE_STATUS:
+            yield line_number, None, f"Unknown status '{status}'"
+            continue
+        row["status"] = status
+        yield line_number, row, None
+
+
+def import_attendance_csv(
+    db: Session,
+    lines: Iterable[str],
+    chunk_size: int = 5000,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """Import an attendance CSV in chunks, committing after each one.
+
+    Check-in and check-out punches for the same employee and day are merged
+    into one row. Only one chunk is held in memory at a time; ``progress`` is
+    called with the running totals after every chunk.
+    """
+    stats = {"processed": 0, "imported": 0, "rejected": 0, "errors": []}
+    departments = employee_departments(db)
+    chunk = {}
+
+    def flush():
+        if chunk:
+            upsert_attendance_rows(db, list(chunk.values()), merge_punches=True, departments=departments)
+            db.commit()
+            stats["imported"] += len(chunk)
+            chunk.clear()
+        if progress:
+            progress(stats)
+
+    for line_number, row, error in parse_attendance_csv(lines, load_employee_code_map(db)):
+        stats["processed"] += 1
+        if error:
+            stats["rejected"] += 1
+            if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+                stats["errors"].append({"line": line_number, "detail": error})
+            continue
+
+        key = (row["employee_id"], row["date"])
+        previous = chunk.get(key)
+        if previous:
+            for column in ("check_in_time", "check_out_time", "notes"):
+                if row[column] is None:
+                    row[column] = previous[column]
+        chunk[key] = row
+        if len(chunk) >= chunk_size:
+            flush()
+
+    flush()
+    return stats
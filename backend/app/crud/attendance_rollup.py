@@ -0,0 +1,154 @@
+"""Incrementally maintained daily attendance rollup."""
+from collections import Counter
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.employee import Employee
+
+
+def employee_departments(db: Session, employee_ids: Optional[Iterable[int]] = None) -> dict:
+    """Map employee ids (all employees when None) to their department id, 0 when unassigned."""
+    query = db.query(Employee.id, Employee.department_id)
+    if employee_ids is not None:
+        employee_ids = set(employee_ids)
+        if not employee_ids:
+            return {}
+        query = query.filter(Employee.id.in_(employee_ids))
+    return {row.id: row.department_id or 0 for row in query}
+
+
+def rollup_key(day: date, department_id: Optional[int], status: str) -> tuple:
+    """Counter key for one rollup row."""
+    return (day, department_id or 0, status)
+
+
+def apply_rollup_deltas(db: Session, deltas: Counter):
+    """Add ``deltas`` ({(date, department_id, status): n}) to the rollup counters.
+
+    Runs in the caller's transaction, so counters commit or roll back together
+    with the attendance rows that produced them.
+    """
+    rows = [
+        {"date": day, "department_id": department_id, "status": status, "count": delta}
+        for (day, department_id, status), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        table = AttendanceDailyRollup.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["date", "department_id", "status"],
+            set_={"count": table.c.count + stmt.excluded.count}
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        updated = db.query(AttendanceDailyRollup).filter(
+            AttendanceDailyRollup.date == row["date"],
+            AttendanceDailyRollup.department_id == row["department_id"],
+            AttendanceDailyRollup.status == row["status"]
+        ).update({AttendanceDailyRollup.count: AttendanceDailyRollup.count + row["count"]})
+        if not updated:
+            db.add(AttendanceDailyRollup(**row))
+
+
+def record_attendance_change(
+    db: Session,
+    old: Optional[tuple] = None,
+    new: Optional[tuple] = None
+):
+    """Adjust the rollup for one attendance row going from ``old`` to ``new``.
+
+    Both are ``(employee_id, date, status)`` tuples, or None for an insert or
+    a delete respectively.
+    """
+    departments = employee_departments(db, [t[0] for t in (old, new) if t])
+    deltas = Counter()
+    if old:
+        deltas[rollup_key(old[1], departments.get(old[0]), old[2])] -= 1
+    if new:
+        deltas[rollup_key(new[1], departments.get(new[0]), new[2])] += 1
+    apply_rollup_deltas(db, deltas)
+
+
+def _employee_rollup_deltas(db: Session, employee_id: int, department_id: Optional[int], sign: int) -> Counter:
+    """Deltas adding (sign=1) or removing (sign=-1) one employee's attendance counts."""
+    deltas = Counter()
+    counts = db.query(Attendance.date, Attendance.status, func.count(Attendance.id))\
+        .filter(Attendance.employee_id == employee_id)\
+        .group_by(Attendance.date, Attendance.status)
+    for day, status, count in counts:
+        deltas[rollup_key(day, department_id, status)] += sign * count
+    return deltas
+
+
+def move_employee_rollup(db: Session, employee_id: int, old_department_id: Optional[int], new_department_id: Optional[int]):
+    """Move an employee's attendance counts to their new department."""
+    if (old_department_id or 0) == (new_department_id or 0):
+        return
+    removed = _employee_rollup_deltas(db, employee_id, old_department_id, -1)
+    deltas = Counter(removed)
+    for (day, _, status), count in removed.items():
+        deltas[rollup_key(day, new_department_id, status)] -= count
+    apply_rollup_deltas(db, deltas)
+
+
+def remove_employee_rollup(db: Session, employee_id: int, department_id: Optional[int]):
+    """Drop an employee's attendance counts before their attendance rows are deleted."""
+    apply_rollup_deltas(db, _employee_rollup_deltas(db, employee_id, department_id, -1))
+
+
+def rebuild_attendance_rollup(db: Session) -> int:
+    """Recompute the whole rollup table from raw attendance rows and commit.
+
+    Returns the number of rollup rows written.
+    """
+    db.query(AttendanceDailyRollup).delete(synchronize_session=False)
+    department_id = func.coalesce(Employee.department_id, literal_column("0"))
+    source = db.query(
+        Attendance.date, department_id, Attendance.status, func.count(Attendance.id)
+    ).join(Employee, Attendance.employee_id == Employee.id)\
+     .group_by(Attendance.date, department_id, Attendance.status)
+    db.execute(
+        AttendanceDailyRollup.__table__.insert().from_select(
+            ["date", "department_id", "status", "count"], source.statement
+        )
+    )
+    db.commit()
+    return db.query(AttendanceDailyRollup).count()
+
+
+def get_status_counts(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    status: Optional[str] = None,
+    department_id: Optional[int] = None
+):
+    """Sum rollup counts per (date, status) between two dates inclusive."""
+    query = db.query(
+        AttendanceDailyRollup.date,
+        AttendanceDailyRollup.status,
+        func.sum(AttendanceDailyRollup.count).label("count")
+    ).filter(
+        AttendanceDailyRollup.date >= start_date,
+        AttendanceDailyRollup.date <= end_date
+    )
+    if status:
+        query = query.filter(AttendanceDailyRollup.status == status)
+    if department_id is not None:
+        query = query.filter(AttendanceDailyRollup.department_id == department_id)
+    return query.group_by(AttendanceDailyRollup.date, AttendanceDailyRollup.status).all()
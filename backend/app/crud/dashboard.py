@@ -0,0 +1,108 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from datetime import date, datetime
+from typing import Optional
+
+from app.models.employee import Employee, Position
+from app.models.dashboard import DashboardSnapshot
+from app.crud.attendance_rollup import get_status_counts
+from app.core.constants import ATTENDANCE_PRESENT, ATTENDANCE_LEAVE
+
+# Snapshot column -> whether its trend is shown as a percentage
+SNAPSHOT_FIELDS = {
+    "total_employees": True,
+    "present_today": True,
+    "on_leave": True,
+    "open_roles": False,
+}
+
+
+def compute_trend(current: int, previous: Optional[int], percent: bool = True) -> dict:
+    """TrendDetail dict comparing a value with the previous period's."""
+    delta = current - (previous or 0)
+    direction = "down" if delta < 0 else "up"
+    if percent and previous:
+        return {"direction": direction, "value": f"{round(delta * 100 / previous):+d}%"}
+    return {"direction": direction, "value": f"{delta:+d}"}
+
+
+# (day, values) this process last stored, so unchanged figures are not rewritten
+_last_stored_snapshot = None
+
+
+def compute_dashboard_snapshot(db: Session, today: date) -> dict:
+    """Compute today's headline figures and store them as today's snapshot.
+
+    The snapshot is only written when the figures differ from what this
+    process last stored for the day, so repeated GETs do not each commit.
+    """
+    global _last_stored_snapshot
+    total_employees, open_roles = db.query(
+        select(func.count(Employee.id)).scalar_subquery(),
+        select(func.count(Position.id)).scalar_subquery(),  # simplistic, maybe add status to Position
+    ).one()
+    today_counts = {row.status: row.count for row in get_status_counts(db, today, today)}
+    values = {
+        "total_employees": total_employees,
+        "present_today": today_counts.get(ATTENDANCE_PRESENT, 0),
+        "on_leave": today_counts.get(ATTENDANCE_LEAVE, 0),
+        "open_roles": open_roles,
+    }
+
+    if _last_stored_snapshot != (today, values):
+        store_dashboard_snapshot(db, today, values)
+        db.commit()
+        _last_stored_snapshot = (today, values)
+    return values
+
+
+def store_dashboard_snapshot(db: Session, today: date, values: dict):
+    """Insert or overwrite the snapshot for ``today`` without committing.
+
+    PostgreSQL and SQLite get a single INSERT ... ON CONFLICT (date) DO UPDATE,
+    so workers computing the day's first snapshot at once do not collide on the
+    primary key; other backends fall back to get-then-insert.
+    """
+    values = {**values, "updated_at": datetime.utcnow()}
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(DashboardSnapshot.__table__).values(date=today, **values)
+        db.execute(stmt.on_conflict_do_update(index_elements=["date"], set_=values))
+        return
+
+    snapshot = db.query(DashboardSnapshot).get(today)
+    if snapshot is None:
+        snapshot = DashboardSnapshot(date=today)
+        db.add(snapshot)
+    for key, value in values.items():
+        setattr(snapshot, key, value)
+
+
+def get_previous_snapshot(db: Session, today: date) -> Optional[DashboardSnapshot]:
+    """Most recent snapshot from before ``today``."""
+    return db.query(DashboardSnapshot)\
+        .filter(DashboardSnapshot.date < today)\
+        .order_by(DashboardSnapshot.date.desc())\
+        .first()
+
+
+def build_dashboard_stats(db: Session, today: Optional[date] = None) -> dict:
+    """Headline figures with trends against the previous period's snapshot."""
+    today = today or date.today()
+    values = compute_dashboard_snapshot(db, today)
+    previous = get_previous_snapshot(db, today)
+    return {
+        key: {
+            "value": value,
+            "trendDetail": compute_trend(
+                value,
+                getattr(previous, key) if previous else None,
+                SNAPSHOT_FIELDS[key]
+            )
+        }
+        for key, value in values.items()
+    }
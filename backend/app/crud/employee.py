@@ -1,13 +1,37 @@
+from fastapi import HTTPException, status as status_codes
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, text, and_, or_
+from datetime import date
 from typing import Optional
 from app.models.employee import Employee, Department, Position
 from app.models.user import User
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+from app.crud.attendance_rollup import move_employee_rollup, remove_employee_rollup
+from app.core.cache import TTLCache, get_version
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.constants import DEFAULT_EMPLOYEE_PASSWORD
+from app.crud.employee_search import search_index, search_rank_expression, uses_search_index
+from app.crud.employee_code import employee_codes
 
+# Sort keys accepted by get_all_employees (always tie-broken by id)
+EMPLOYEE_SORT_COLUMNS = {
+    "id": Employee.id,
+    "employee_id": Employee.employee_id,
+    "date_of_joining": Employee.date_of_joining,
+}
 
-def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
-    """Create a new employee with auto-sequenced ID and automatic User creation."""
+# Totals keyed by (filters, employees data version)
+_employee_count_cache = TTLCache(ttl=300, maxsize=256)
+
+
+def create_employee(db: Session, employee: EmployeeCreate, hashed_password: Optional[str] = None) -> Employee:
+    """Create a new employee with auto-sequenced ID and automatic User creation.
+
+    ``hashed_password`` is DEFAULT_EMPLOYEE_PASSWORD already hashed (see create_user).
+    """
+    # Reserve the employee code (EMP-001, EMP-002, etc.) before writing anything
+    employee_code = employee_codes.allocate(db)[0]
+    
     # 1. Create User record first
     from app.crud.user import create_user
     from app.schemas.user import UserCreate
@@ -19,10 +43,10 @@ def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
         email=employee.email,
         username=username,
         full_name=employee.full_name,
-        password="password123", # Default password
+        password=DEFAULT_EMPLOYEE_PASSWORD,
         role="employee"
     )
-    db_user = create_user(db, user_in)
+    db_user = create_user(db, user_in, hashed_password)
     
     # 2. Prepare Employee data
     employee_data = employee.dict(exclude={'full_name', 'email', 'username'})
@@ -49,21 +73,23 @@ def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
             db.flush()
         employee_data['position_id'] = pos.id
     
-    # Auto-generate employee_id: EMP-001, EMP-002, etc.
-    max_id = db.query(func.max(Employee.id)).scalar() or 0
-    employee_data['employee_id'] = f"EMP-{max_id + 1:03d}"
+    employee_data['employee_id'] = employee_code
     
     db_employee = Employee(**employee_data)
     db.add(db_employee)
     db.commit()
     db.refresh(db_employee)
+    search_index.upsert(
+        db_employee.id, db_user.id, db_user.full_name, db_user.email,
+        db_employee.employee_id, db_employee.department_id, db_user.is_active
+    )
     return db_employee
 
 
-def get_employee_by_id(db: Session, employee_id: int) -> Employee:
-    """Get employee by ID."""
-    return db.query(
-        Employee.id, Employee.user_id, Employee.employee_id, 
+def employee_detail_columns():
+    """Columns that make up an employee's joined detail row (EmployeeResponse)."""
+    return (
+        Employee.id, Employee.user_id, Employee.employee_id,
         Employee.department_id, Employee.position_id, Employee.phone,
         Employee.date_of_birth, Employee.date_of_joining, Employee.salary,
         Employee.address, Employee.city, Employee.state, Employee.country,
@@ -71,10 +97,24 @@ def get_employee_by_id(db: Session, employee_id: int) -> Employee:
         User.full_name, User.email, User.username, User.is_active,
         Department.name.label("department"),
         Position.title.label("position")
-    ).join(User, Employee.user_id == User.id)\
-     .outerjoin(Department, Employee.department_id == Department.id)\
-     .outerjoin(Position, Employee.position_id == Position.id)\
-     .filter(Employee.id == employee_id).first()
+    )
+
+
+def join_employee_details(query):
+    """Join the User, Department and Position tables needed by employee_detail_columns()."""
+    return query.join(User, Employee.user_id == User.id)\
+        .outerjoin(Department, Employee.department_id == Department.id)\
+        .outerjoin(Position, Employee.position_id == Position.id)
+
+
+def employee_detail_query(db: Session):
+    """Base query returning joined employee detail rows."""
+    return join_employee_details(db.query(*employee_detail_columns()))
+
+
+def get_employee_by_id(db: Session, employee_id: int) -> Employee:
+    """Get employee by ID."""
+    return employee_detail_query(db).filter(Employee.id == employee_id).first()
 
 
 def get_employee_by_user_id(db: Session, user_id: int) -> Employee:
@@ -82,28 +122,8 @@ def get_employee_by_user_id(db: Session, user_id: int) -> Employee:
     return db.query(Employee).filter(Employee.user_id == user_id).first()
 
 
-def get_all_employees(
-    db: Session, 
-    skip: int = 0, 
-    limit: int = 100,
-    search: Optional[str] = None,
-    department_id: Optional[int] = None,
-    status: Optional[str] = None
-):
-    """Get all employees with pagination, filtering and joined info."""
-    query = db.query(
-        Employee.id, Employee.user_id, Employee.employee_id, 
-        Employee.department_id, Employee.position_id, Employee.phone,
-        Employee.date_of_birth, Employee.date_of_joining, Employee.salary,
-        Employee.address, Employee.city, Employee.state, Employee.country,
-        Employee.postal_code, Employee.created_at, Employee.updated_at,
-        User.full_name, User.email, User.username, User.is_active,
-        Department.name.label("department"),
-        Position.title.label("position")
-    ).join(User, Employee.user_id == User.id)\
-     .outerjoin(Department, Employee.department_id == Department.id)\
-     .outerjoin(Position, Employee.position_id == Position.id)
-    
+def filter_employees(query, search: Optional[str] = None, department_id: Optional[int] = None, status: Optional[str] = None):
+    """Apply the employee list filters to a query that already joins User."""
     if search:
         search_filter = f"%{search}%"
         query = query.filter(
@@ -119,11 +139,135 @@ def get_all_employees(
         query = query.filter(User.is_active == True)
     elif status == "inactive":
         query = query.filter(User.is_active == False)
+    return query
+
+
+def count_employees(
+    db: Session,
+    search: Optional[str] = None,
+    department_id: Optional[int] = None,
+    status: Optional[str] = None,
+    mode: str = "cached"
+) -> int:
+    """Count employees matching the list filters.
+
+    ``exact`` always runs COUNT(*); ``cached`` counts once per filter signature
+    and employees data version; ``estimate`` reads PostgreSQL table statistics
+    for unfiltered listings and falls back to ``cached`` otherwise.
+    """
+    filtered = bool(search or department_id or status in ("active", "inactive"))
+    if mode == "estimate" and not filtered and db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'employees'")
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return estimate
+
+    def exact():
+        query = db.query(func.count(Employee.id)).join(User, Employee.user_id == User.id)
+        return filter_employees(query, search, department_id, status).scalar()
+
+    if mode == "exact":
+        return exact()
+    cache_key = (search, department_id, status, get_version("employees"))
+    return _employee_count_cache.get_or_set(cache_key, exact)
+
+
+def parse_employee_cursor(after: list, sort: str) -> tuple:
+    """(sort value, employee id) from a decoded cursor; 400 unless it fits ``sort``."""
+    try:
+        cursor_sort, after_value, after_id = after
+        if cursor_sort != sort or not isinstance(after_id, int) or isinstance(after_id, bool):
+            raise ValueError(after)
+        if sort == "id":
+            if not isinstance(after_value, int) or isinstance(after_value, bool):
+                raise ValueError(after_value)
+        elif sort == "date_of_joining":
+            after_value = date.fromisoformat(after_value)
+        elif not isinstance(after_value, str):
+            raise ValueError(after_value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status_codes.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return after_value, after_id
+
+
+def get_all_employees(
+    db: Session, 
+    skip: int = 0, 
+    limit: int = 100,
+    search: Optional[str] = None,
+    department_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    count: str = "cached"
+):
+    """Get all employees with pagination, filtering and joined info.
+
+    Rows are ordered by ``sort`` then id. When ``cursor`` (the next-page cursor
+    returned with a previous page) is given, the page is fetched by keyset
+    instead of ``skip``, so deep pages cost the same as the first one.
+    Searches are ranked by match quality instead (see search_employees).
+    Returns the rows, the total (see count_employees) and the next cursor.
+    """
+    after = decode_cursor(cursor)
+    if search:
+        if after:
+            raise HTTPException(
+                status_code=status_codes.HTTP_400_BAD_REQUEST,
+                detail="cursor cannot be combined with search; page search results with skip"
+            )
+        return search_employees(db, search, skip, limit, department_id, status)
+
+    sort_column = EMPLOYEE_SORT_COLUMNS[sort]
+    query = filter_employees(employee_detail_query(db), search, department_id, status)
+    
+    if after:
+        after_value, after_id = parse_employee_cursor(after, sort)
+        query = query.filter(or_(
+            sort_column > after_value,
+            and_(sort_column == after_value, Employee.id > after_id)
+        ))
     
-    total = query.count()
-    employees = query.offset(skip).limit(limit).all()
+    query = query.order_by(sort_column, Employee.id)
+    if not after:
+        query = query.offset(skip)
+    employees = query.limit(limit).all()
+    total = count_employees(db, search, department_id, status, mode=count)
     
-    return employees, total
+    next_cursor = None
+    if len(employees) == limit:
+        last = employees[-1]
+        next_cursor = encode_cursor(sort, getattr(last, sort), last.id)
+    
+    return employees, total, next_cursor
+
+
+def search_employees(
+    db: Session,
+    search: str,
+    skip: int = 0,
+    limit: int = 100,
+    department_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    """Search employees by name, email or code, best matches first.
+
+    Returns the same (rows, total, next_cursor) triple as get_all_employees;
+    ranked results are paged by offset, so next_cursor is always None.
+    """
+    if not uses_search_index(db):
+        query = filter_employees(employee_detail_query(db), search, department_id, status)
+        employees = query.order_by(search_rank_expression(search), Employee.id)\
+            .offset(skip).limit(limit).all()
+        return employees, count_employees(db, search, department_id, status), None
+
+    ranked_ids = search_index.search(db, search, department_id, status)
+    page_ids = ranked_ids[skip:skip + limit]
+    if not page_ids:
+        return [], len(ranked_ids), None
+    rows = {row.id: row for row in employee_detail_query(db).filter(Employee.id.in_(page_ids))}
+    return [rows[employee_id] for employee_id in page_ids if employee_id in rows], len(ranked_ids), None
 
 
 def update_employee(db: Session, employee_id: int, employee_update: EmployeeUpdate) -> Employee:
@@ -153,11 +297,15 @@ def update_employee(db: Session, employee_id: int, employee_update: EmployeeUpda
                 db.flush()
             update_data['position_id'] = pos.id
             
+        if 'department_id' in update_data:
+            move_employee_rollup(db, db_employee.id, db_employee.department_id, update_data['department_id'])
+            
         for key, value in update_data.items():
             setattr(db_employee, key, value)
         db.add(db_employee)
         db.commit()
         db.refresh(db_employee)
+        search_index.update_department(db_employee.id, db_employee.department_id)
     return db_employee
 
 
@@ -165,8 +313,10 @@ def delete_employee(db: Session, employee_id: int) -> bool:
     """Delete an employee."""
     db_employee = db.query(Employee).get(employee_id)
     if db_employee:
+        remove_employee_rollup(db, db_employee.id, db_employee.department_id)
         db.delete(db_employee)
         db.commit()
+        search_index.remove(employee_id)
         return True
     return False
 
@@ -0,0 +1,134 @@
+"""Employee code (EMP-001, EMP-002, ...) allocation.
+
+Codes are handed out without reading the employees table, so concurrent
+creates never race each other into the ``employee_id`` unique constraint:
+
+* PostgreSQL draws numbers from the ``employee_code_seq`` sequence.
+* Other databases (SQLite) reserve a block of numbers from the
+  ``id_counters`` table in a short transaction of their own and hand them out
+  from memory. Numbers left in a block when the process exits are skipped.
+
+The first allocation in each process moves the counter past the highest
+existing code, which covers databases created before the counter existed.
+"""
+import threading
+from typing import List
+
+from sqlalchemy import BigInteger, cast, func, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.counter import IdCounter
+from app.models.employee import Employee, employee_code_seq
+from app.core.constants import EMPLOYEE_CODE_BLOCK_SIZE
+
+EMPLOYEE_CODE_PREFIX = "EMP-"
+
+# id_counters row used for employee codes
+EMPLOYEE_CODE_COUNTER = "employee_code"
+
+
+def format_employee_code(number: int) -> str:
+    return f"{EMPLOYEE_CODE_PREFIX}{number:03d}"
+
+
+def highest_employee_code(conn) -> int:
+    """Largest number used by an existing EMP-nnn code (0 if there are none)."""
+    number = cast(func.substr(Employee.employee_id, len(EMPLOYEE_CODE_PREFIX) + 1), BigInteger)
+    query = select(func.max(number))
+    if conn.dialect.name == "postgresql":
+        query = query.where(Employee.employee_id.op("~")(f"^{EMPLOYEE_CODE_PREFIX}[0-9]+$"))
+    else:
+        query = query.where(Employee.employee_id.like(f"{EMPLOYEE_CODE_PREFIX}%"))
+    return conn.execute(query).scalar() or 0
+
+
+class EmployeeCodeAllocator:
+    """Hands out unique employee codes; see the module docstring."""
+
+    def __init__(self, block_size: int = EMPLOYEE_CODE_BLOCK_SIZE):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = {}  # database url -> (next number, end of reserved block)
+        self._synced = set()  # database urls whose counter is past existing codes
+
+    def allocate(self, db: Session, count: int = 1) -> List[str]:
+        """Reserve ``count`` new employee codes.
+
+        On SQLite this writes through a separate connection, so call it before
+        the session itself has written anything in its current transaction.
+        """
+        if count <= 0:
+            return []
+        if db.get_bind().dialect.name == "postgresql":
+            numbers = self._from_sequence(db, count)
+        else:
+            numbers = self._from_counter(db.get_bind(), count)
+        return [format_employee_code(number) for number in numbers]
+
+    def reset(self):
+        """Forget reserved blocks (e.g. after the database was recreated)."""
+        with self._lock:
+            self._blocks.clear()
+            self._synced.clear()
+
+    def _from_sequence(self, db: Session, count: int) -> List[int]:
+        conn = db.connection()
+        key = str(conn.engine.url)
+        if key not in self._synced:
+            # nextval/setval are not transactional, so this never blocks other creators
+            conn.execute(
+                text(
+                    "SELECT setval('employee_code_seq', :floor) "
+                    "WHERE :floor > (SELECT last_value FROM employee_code_seq)"
+                ),
+                {"floor": highest_employee_code(conn)}
+            )
+            self._synced.add(key)
+        return list(conn.execute(
+            select(employee_code_seq.next_value()).select_from(func.generate_series(1, count))
+        ).scalars())
+
+    def _from_counter(self, engine, count: int) -> List[int]:
+        # The lock only guards in-memory state, never a database round trip,
+        # so it is also safe on the event loop in async engine mode
+        key = str(engine.url)
+        numbers = []
+        while True:
+            with self._lock:
+                next_number, end = self._blocks.get(key, (0, 0))
+                take = min(count - len(numbers), end - next_number)
+                numbers.extend(range(next_number, next_number + take))
+                self._blocks[key] = (next_number + take, end)
+            if len(numbers) == count:
+                return numbers
+            block = self._reserve(engine, max(count - len(numbers), self.block_size))
+            with self._lock:
+                self._blocks[key] = block
+
+    def _reserve(self, engine, size: int):
+        """Advance the counter row by ``size`` and return the reserved [start, end)."""
+        counter = IdCounter.name == EMPLOYEE_CODE_COUNTER
+        for attempt in range(2):
+            try:
+                with engine.begin() as conn:
+                    if str(engine.url) not in self._synced:
+                        floor = highest_employee_code(conn) + 1
+                        current = conn.execute(select(IdCounter.next_value).where(counter)).scalar()
+                        if current is None:
+                            conn.execute(insert(IdCounter).values(name=EMPLOYEE_CODE_COUNTER, next_value=floor))
+                        elif current < floor:
+                            conn.execute(update(IdCounter).where(counter).values(next_value=floor))
+                    conn.execute(
+                        update(IdCounter).where(counter).values(next_value=IdCounter.next_value + size)
+                    )
+                    end = conn.execute(select(IdCounter.next_value).where(counter)).scalar_one()
+                self._synced.add(str(engine.url))
+                return end - size, end
+            except IntegrityError:
+                # Another process created the counter row first
+                if attempt:
+                    raise
+
+
+employee_codes = EmployeeCodeAllocator()
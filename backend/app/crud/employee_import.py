@@ -0,0 +1,260 @@
+"""Bulk employee onboarding from CSV or JSON rows."""
+import csv
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee, Department, Position
+from app.models.user import User
+from app.schemas.employee import EmployeeCreate
+from app.core.config import settings
+from app.core.constants import ROLE_EMPLOYEE, DEFAULT_EMPLOYEE_PASSWORD
+from app.core.security import hash_password, get_pwd_context
+from app.crud.employee_search import search_index
+from app.crud.employee_code import employee_codes
+
+# Batches smaller than this are hashed in-process; process start-up costs more
+MIN_PARALLEL_HASHES = 32
+
+# Rows inserted per transaction
+INSERT_CHUNK_SIZE = 1000
+
+# CSV header aliases -> EmployeeCreate field
+CSV_COLUMN_ALIASES = {
+    "department": "department_id",
+    "position": "position_id",
+}
+
+
+def read_employee_csv(lines: Iterable[str]) -> List[dict]:
+    """Parse an onboarding CSV into raw row dicts (empty cells dropped)."""
+    rows = []
+    for record in csv.DictReader(lines):
+        row = {}
+        for key, value in record.items():
+            if key is None or value is None or not value.strip():
+                continue
+            key = key.strip().lower()
+            value = value.strip()
+            key = CSV_COLUMN_ALIASES.get(key, key)
+            if key in ("department_id", "position_id") and value.isdigit():
+                value = int(value)
+            row[key] = value
+        rows.append(row)
+    return rows
+
+
+def _hash_password(password: str) -> str:
+    # Runs in pool processes, so bypasses the in-process password executor
+    return get_pwd_context().hash(password)
+
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all imports, started on first use.
+
+    Workers are spawned rather than forked, so they do not inherit the
+    server's threads or open database connections.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """bcrypt-hash many passwords, spread over the process pool for large batches."""
+    global _hash_pool
+    if len(passwords) < MIN_PARALLEL_HASHES:
+        return [hash_password(password) for password in passwords]
+    try:
+        return list(get_hash_pool().map(_hash_password, passwords, chunksize=16))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time
+        with _hash_pool_lock:
+            _hash_pool = None
+    except (OSError, NotImplementedError):
+        # No process support (e.g. some serverless runtimes)
+        pass
+    return [hash_password(password) for password in passwords]
+
+
+def resolve_names(db: Session, model, column, names: set, normalize: Callable[[str], str]) -> dict:
+    """Map lower-cased department/position names to ids in one lookup.
+
+    Missing names are created (as ``normalize(name)``) with a single insert.
+    """
+    if not names:
+        return {}
+    wanted = {name.lower(): normalize(name) for name in names}
+    candidates = set(wanted) | {value.lower() for value in wanted.values()}
+    existing = {
+        value.lower(): row_id
+        for row_id, value in db.query(model.id, column).filter(func.lower(column).in_(candidates))
+    }
+
+    resolved, missing = {}, {}
+    for key, value in wanted.items():
+        row_id = existing.get(key) or existing.get(value.lower())
+        if row_id:
+            resolved[key] = row_id
+        else:
+            missing.setdefault(value.lower(), value)
+    if missing:
+        created = db.execute(
+            insert(model).returning(model.id, column, sort_by_parameter_order=True),
+            [{column.key: value} for value in missing.values()]
+        )
+        created = {value.lower(): row_id for row_id, value in created}
+        for key, value in wanted.items():
+            if key not in resolved:
+                resolved[key] = created[value.lower()]
+    return resolved
+
+
+def bulk_create_employees(
+    db: Session,
+    raw_rows: List[dict],
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """Create users and employees for many rows in a few transactions.
+
+    Invalid rows and rows clashing with existing or earlier emails/usernames
+    are reported per row without aborting the rest of the batch. A chunk whose
+    insert fails is retried row by row in savepoints, so only the rows the
+    database refuses are rejected.
+    """
+    results = [None] * len(raw_rows)
+    valid = []  # (index, EmployeeCreate, username, password)
+
+    def reject(index, detail):
+        results[index] = {"index": index, "outcome": "rejected", "detail": detail}
+
+    for index, raw in enumerate(raw_rows):
+        if not isinstance(raw, dict):
+            reject(index, "Row must be an object")
+            continue
+        raw = dict(raw)
+        password = raw.pop("password", None)
+        try:
+            employee = EmployeeCreate(**raw)
+        except ValidationError as e:
+            reject(index, "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            ))
+            continue
+        username = employee.username or employee.email.split('@')[0]
+        valid.append((index, employee, username, password or DEFAULT_EMPLOYEE_PASSWORD))
+
+    # Emails / usernames already taken, in one query each
+    emails = {employee.email for _, employee, _, _ in valid}
+    usernames = {username for _, _, username, _ in valid}
+    taken_emails = {row.email for row in db.query(User.email).filter(User.email.in_(emails))} if emails else set()
+    taken_usernames = {row.username for row in db.query(User.username).filter(User.username.in_(usernames))} if usernames else set()
+
+    accepted = []
+    for index, employee, username, password in valid:
+        if employee.email in taken_emails:
+            reject(index, "Email already registered")
+        elif username in taken_usernames:
+            reject(index, "Username already taken")
+        else:
+            taken_emails.add(employee.email)
+            taken_usernames.add(username)
+            accepted.append((index, employee, username, password))
+
+    # Every distinct department / position name resolved in one pass
+    department_names = {e.department_id for _, e, _, _ in accepted if isinstance(e.department_id, str)}
+    position_names = {e.position_id for _, e, _, _ in accepted if isinstance(e.position_id, str)}
+    departments = resolve_names(db, Department, Department.name, department_names, lambda name: name.upper())
+    positions = resolve_names(db, Position, Position.title, position_names, lambda name: name.replace('_', ' ').title())
+    db.commit()
+
+    hashed = hash_passwords([password for _, _, _, password in accepted])
+
+    codes = employee_codes.allocate(db, len(accepted))
+
+    def insert_rows(rows, row_hashes, row_codes):
+        user_ids = db.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {
+                    "email": employee.email,
+                    "username": username,
+                    "full_name": employee.full_name,
+                    "hashed_password": password_hash,
+                    "role": ROLE_EMPLOYEE,
+                    "is_active": True,
+                }
+                for (_, employee, username, _), password_hash in zip(rows, row_hashes)
+            ]
+        ).all()
+
+        employee_rows = []
+        for (index, employee, _, _), user_id, code in zip(rows, user_ids, row_codes):
+            data = employee.dict(exclude={'full_name', 'email', 'username'})
+            data['user_id'] = user_id
+            if isinstance(data['department_id'], str):
+                data['department_id'] = departments[data['department_id'].lower()]
+            if isinstance(data['position_id'], str):
+                data['position_id'] = positions[data['position_id'].lower()]
+            data['employee_id'] = code
+            employee_rows.append(data)
+        employee_ids = db.scalars(
+            insert(Employee).returning(Employee.id, sort_by_parameter_order=True),
+            employee_rows
+        ).all()
+        return list(zip(rows, user_ids, employee_ids, employee_rows))
+
+    stats = {"created": 0, "rejected": 0, "total": len(raw_rows)}
+    for start in range(0, len(accepted), INSERT_CHUNK_SIZE):
+        chunk = accepted[start:start + INSERT_CHUNK_SIZE]
+        chunk_hashes = hashed[start:start + INSERT_CHUNK_SIZE]
+        chunk_codes = codes[start:start + INSERT_CHUNK_SIZE]
+        try:
+            inserted = insert_rows(chunk, chunk_hashes, chunk_codes)
+            db.commit()
+        except SQLAlchemyError:
+            # Retry the chunk row by row, so only the offending rows are rejected
+            db.rollback()
+            inserted = []
+            for row, password_hash, code in zip(chunk, chunk_hashes, chunk_codes):
+                try:
+                    with db.begin_nested():
+                        inserted += insert_rows([row], [password_hash], [code])
+                except SQLAlchemyError as e:
+                    reject(row[0], f"Database error: {e.__class__.__name__}")
+            db.commit()
+
+        for (index, employee, username, _), user_id, employee_id, row in inserted:
+            results[index] = {
+                "index": index,
+                "outcome": "created",
+                "id": employee_id,
+                "employee_id": row['employee_id'],
+                "email": employee.email,
+            }
+            search_index.upsert(
+                employee_id, user_id, employee.full_name, employee.email,
+                row['employee_id'], row['department_id'], True
+            )
+        stats["created"] += len(inserted)
+        if progress:
+            progress(stats)
+
+    stats["rejected"] = sum(1 for result in results if result["outcome"] == "rejected")
+    return {**stats, "results": results}
@@ -0,0 +1,178 @@
+"""Ranked employee search.
+
+PostgreSQL answers ``ILIKE '%term%'`` from the trigram GIN indexes created by
+the search migration. Other databases (SQLite in development) use the
+in-process n-gram index below, which is built on first use and then kept up
+to date by the employee and user CRUD functions.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+from app.models.user import User
+
+NGRAM_SIZE = 3
+
+# Rebuild the in-process index after this long, to pick up writes made by
+# other worker processes
+INDEX_MAX_AGE_SECONDS = 300
+
+
+def ngrams(text: str) -> set:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def match_rank(term: str, fields) -> Optional[int]:
+    """0 exact match, 1 prefix, 2 word prefix, 3 substring, None no match."""
+    best = None
+    for field in fields:
+        if field == term:
+            return 0
+        if field.startswith(term):
+            rank = 1
+        elif term in field:
+            rank = 2 if any(word.startswith(term) for word in field.replace("@", " ").replace(".", " ").split()) else 3
+        else:
+            continue
+        if best is None or rank < best:
+            best = rank
+    return best
+
+
+def search_rank_expression(term: str):
+    """SQL ordering expression mirroring match_rank() for the PostgreSQL path."""
+    term = term.lower()
+    fields = (func.lower(User.full_name), func.lower(User.email), func.lower(Employee.employee_id))
+    return case(
+        *[(field == term, 0) for field in fields],
+        *[(field.startswith(term, autoescape=True), 1) for field in fields],
+        *[(field.contains(" " + term, autoescape=True), 2) for field in fields],
+        else_=3
+    )
+
+
+class EmployeeSearchIndex:
+    """In-memory n-gram index over employee name, email and code."""
+
+    def __init__(self, max_age_seconds: float = INDEX_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._docs = {}  # employee id -> (fields, department_id, is_active, user_id)
+        self._by_user = {}
+        self._postings = defaultdict(set)
+        self._built_at = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def build(self, db: Session):
+        """Load every employee from the database in one query."""
+        rows = db.query(
+            Employee.id, Employee.user_id, Employee.employee_id, Employee.department_id,
+            User.full_name, User.email, User.is_active
+        ).join(User, Employee.user_id == User.id).all()
+        with self._lock:
+            self._docs.clear()
+            self._by_user.clear()
+            self._postings.clear()
+            for row in rows:
+                self._add(row.id, row.user_id, row.full_name, row.email, row.employee_id,
+                          row.department_id, row.is_active)
+            self._built_at = time.monotonic()
+
+    def _add(self, employee_id, user_id, full_name, email, code, department_id, is_active):
+        fields = tuple((value or "").lower() for value in (full_name, email, code))
+        self._docs[employee_id] = (fields, department_id, is_active, user_id)
+        self._by_user[user_id] = employee_id
+        for gram in set().union(*(ngrams(field) for field in fields)):
+            self._postings[gram].add(employee_id)
+
+    def remove(self, employee_id: int):
+        with self._lock:
+            doc = self._docs.pop(employee_id, None)
+            if doc is None:
+                return
+            self._by_user.pop(doc[3], None)
+            for gram in set().union(*(ngrams(field) for field in doc[0])):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(employee_id)
+                    if not postings:
+                        del self._postings[gram]
+
+    def upsert(self, employee_id, user_id, full_name, email, code, department_id, is_active):
+        """Add or replace one employee; a no-op until the index has been built."""
+        with self._lock:
+            if not self.is_built:
+                return
+            self.remove(employee_id)
+            self._add(employee_id, user_id, full_name, email, code, department_id, is_active)
+
+    def update_user(self, user_id: int, **changes):
+        """Apply User column changes (full_name, email, is_active) to its employee."""
+        with self._lock:
+            employee_id = self._by_user.get(user_id)
+            if employee_id is None:
+                return
+            (full_name, email, code), department_id, is_active, _ = self._docs[employee_id]
+            full_name = changes.get("full_name", full_name)
+            email = changes.get("email", email)
+            is_active = changes.get("is_active", is_active)
+            self.upsert(employee_id, user_id, full_name, email, code, department_id, is_active)
+
+    def update_department(self, employee_id: int, department_id: Optional[int]):
+        with self._lock:
+            doc = self._docs.get(employee_id)
+            if doc is not None:
+                self._docs[employee_id] = (doc[0], department_id, doc[2], doc[3])
+
+    def search(
+        self,
+        db: Session,
+        term: str,
+        department_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> list:
+        """Ids of matching employees, best matches first."""
+        if not self.is_built or time.monotonic() - self._built_at > self.max_age_seconds:
+            self.build(db)
+        term = term.strip().lower()
+        with self._lock:
+            if len(term) >= NGRAM_SIZE:
+                postings = sorted((self._postings.get(gram, set()) for gram in ngrams(term)), key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+            else:
+                candidates = self._docs.keys()
+
+            ranked = []
+            for employee_id in candidates:
+                fields, doc_department_id, is_active, _ = self._docs[employee_id]
+                if department_id and doc_department_id != department_id:
+                    continue
+                if status == "active" and is_active is not True:
+                    continue
+                if status == "inactive" and is_active is not False:
+                    continue
+                rank = match_rank(term, fields)
+                if rank is not None:
+                    ranked.append((rank, employee_id))
+        ranked.sort()
+        return [employee_id for _, employee_id in ranked]
+
+
+search_index = EmployeeSearchIndex()
+
+
+def uses_search_index(db: Session) -> bool:
+    """Whether searches on this session go through the in-process index."""
+    return db.get_bind().dialect.name != "postgresql"
@@ -0,0 +1,77 @@
+"""Refresh-token revocation.
+
+Refresh tokens are single use: /api/auth/refresh revokes the presented token
+(by its ``jti``) while issuing a new one, and /api/auth/logout revokes it
+outright. Revocations are stored in the ``revoked_tokens`` table; each process
+also keeps a Bloom filter of revoked ids, loaded on first use, so checking a
+token that was never revoked needs no query. A filter hit is confirmed
+against the table, since Bloom filters give occasional false positives.
+"""
+import hashlib
+import threading
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.models.token import RevokedToken
+
+
+def refresh_token_id(token: str, payload: dict) -> str:
+    """The token's ``jti``, or a digest of the token for tokens issued without one."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+class RefreshTokenRevocations:
+    """Revoked refresh-token ids: the database table fronted by a Bloom filter."""
+
+    def __init__(self, capacity: int = settings.REFRESH_REVOCATION_CAPACITY):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._filter = None
+
+    def load(self, db: Session):
+        """Drop expired revocations and rebuild the filter from the rest."""
+        now = datetime.utcnow()
+        db.query(RevokedToken).filter(RevokedToken.expires_at < now).delete(synchronize_session=False)
+        db.commit()
+        count = db.query(RevokedToken).count()
+        bloom = BloomFilter(max(self.capacity, count * 2))
+        for (jti,) in db.query(RevokedToken.jti).yield_per(10000):
+            bloom.add(jti)
+        with self._lock:
+            self._filter = bloom
+
+    def _get_filter(self, db: Session) -> BloomFilter:
+        if self._filter is None or self._filter.count >= self._filter.capacity:
+            self.load(db)
+        return self._filter
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        if jti not in self._get_filter(db):
+            return False
+        return db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first() is not None
+
+    def revoke(self, db: Session, jti: str, user_id: int, expires_at: datetime) -> bool:
+        """Revoke a token; returns False if it was already revoked.
+
+        The insert itself is the authoritative check (jti is the primary key),
+        so two workers rotating the same token can never both succeed.
+        """
+        bloom = self._get_filter(db)
+        if jti in bloom and self.is_revoked(db, jti):
+            return False
+        try:
+            db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        finally:
+            bloom.add(jti)
+        return True
+
+
+refresh_revocations = RefreshTokenRevocations()
@@ -1,16 +1,28 @@
+from typing import Optional
+from sqlalchemy import case, or_
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import hash_password, verify_password
+from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import hash_password, verify_and_update_password
+from app.crud.employee_search import search_index
 
+# /api/auth/me responses keyed by user id; dropped by update_user / delete_user
+_principal_cache = TTLCache(ttl=settings.USER_PRINCIPAL_CACHE_TTL_SECONDS, maxsize=1024)
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create a new user."""
+
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    """Create a new user.
+
+    Async routes pass ``hashed_password`` (from hash_password_async) so bcrypt
+    does not run while this holds a threadpool thread.
+    """
     db_user = User(
         email=user.email,
         username=user.username,
         full_name=user.full_name,
-        hashed_password=hash_password(user.password),
+        hashed_password=hashed_password or hash_password(user.password),
         role=user.role
     )
     db.add(db_user)
@@ -29,11 +41,45 @@ def get_user_by_id(db: Session, user_id: int) -> User:
     return db.query(User).filter(User.id == user_id).first()
 
 
+def get_user_principal(db: Session, user_id: int) -> Optional[UserResponse]:
+    """The user as returned by /api/auth/me.
+
+    Served from memory for USER_PRINCIPAL_CACHE_TTL_SECONDS when that is set.
+    """
+    if _principal_cache.ttl > 0:
+        principal = _principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+    user = get_user_by_id(db, user_id)
+    if not user:
+        return None
+    principal = UserResponse.model_validate(user)
+    if _principal_cache.ttl > 0:
+        _principal_cache.set(user_id, principal)
+    return principal
+
+
 def get_user_by_username(db: Session, username: str) -> User:
     """Get user by username."""
     return db.query(User).filter(User.username == username).first()
 
 
+def get_user_by_login(db: Session, login: str) -> User:
+    """Get user by email or username in one query (an email match wins)."""
+    return db.query(User)\
+        .filter(or_(User.email == login, User.username == login))\
+        .order_by(case((User.email == login, 0), else_=1))\
+        .first()
+
+
+def save_password_hash(db: Session, user: User, hashed_password: str):
+    """Store a rehashed password (e.g. after a bcrypt cost change)."""
+    user.hashed_password = hashed_password
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
 def get_all_users(db: Session, skip: int = 0, limit: int = 100):
     """Get all users with pagination."""
     return db.query(User).offset(skip).limit(limit).all()
@@ -49,6 +95,8 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
         db.add(db_user)
         db.commit()
         db.refresh(db_user)
+        _principal_cache.pop(db_user.id)
+        search_index.update_user(db_user.id, **update_data)
     return db_user
 
 
@@ -59,15 +107,20 @@ def delete_user(db: Session, user_id: int) -> bool:
         db_user.is_active = False
         db.add(db_user)
         db.commit()
+        _principal_cache.pop(user_id)
+        search_index.update_user(user_id, is_active=False)
         return True
     return False
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User:
-    """Authenticate user by email and password."""
-    user = get_user_by_email(db, email)
+def authenticate_user(db: Session, login: str, password: str) -> User:
+    """Authenticate user by email or username and password."""
+    user = get_user_by_login(db, login)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        save_password_hash(db, user, new_hash)
     return user
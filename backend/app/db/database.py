@@ -1,27 +1,202 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.cache import bump_versions, tables_to_families
+from app.db.pool import create_pooled_engine
+
+# Create database engine (pool settings: see app/db/pool.py)
+engine = create_pooled_engine("primary", settings.sqlalchemy_database_url)
+
+# Optional read replica, used by the read-only dependencies below
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_pooled_engine("replica", settings.sqlalchemy_replica_url)
+
+# Cookie telling later requests from a client that it wrote recently
+PRIMARY_COOKIE = "db_primary_until"
+
+# Wall-clock time of this process's last committed write
+_last_write_at = 0.0
+
+
+class TrackedSession(Session):
+    """Session that records the tables it writes, to bump data versions on commit.
+
+    Sessions opened for reads carry ``info["replica_bind"]`` and send queries
+    to the replica; the first write moves the session to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica_bind")
+        if replica is not None:
+            if not self._flushing and not isinstance(clause, UpdateBase):
+                return replica
+            del self.info["replica_bind"]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
 
-# Create database engine
-engine = create_engine(
-    settings.sqlalchemy_database_url,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=TrackedSession, autocommit=False, autoflush=False, bind=engine)
+
+# Async engine used by request handlers when DATABASE_ASYNC is set. The sync
+# engine above stays available for CLIs, streaming and background work.
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = create_pooled_engine("async_primary", settings.async_database_url, is_async=True)
+    # Objects are not expired on commit: response models read them after the
+    # session's greenlet has returned, where lazy loads are not possible
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, sync_session_class=TrackedSession, autoflush=False, expire_on_commit=False
+    )
+    if settings.DATABASE_REPLICA_URL:
+        async_replica_engine = create_pooled_engine("async_replica", settings.async_replica_url, is_async=True)
+
+
+def use_replica(request: Request = None) -> bool:
+    """Whether reads may go to the replica.
+
+    Not within READ_YOUR_WRITES_SECONDS of a write committed by this process
+    (which also keeps version-keyed caches from being filled from a lagging
+    replica), nor of one made by this client according to its cookie.
+    """
+    if replica_engine is None:
+        return False
+    now = time.time()
+    if now - _last_write_at < settings.READ_YOUR_WRITES_SECONDS:
+        return False
+    if request is not None:
+        try:
+            if float(request.cookies.get(PRIMARY_COOKIE, 0)) > now:
+                return False
+        except ValueError:
+            pass
+    return True
+
+
+def _changed_tables(session):
+    return session.info.setdefault("changed_tables", set())
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    """Remember which tables ORM flushes wrote to."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            _changed_tables(session).add(table.name)
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _track_statement_tables(orm_execute_state):
+    """Remember which tables bulk INSERT / UPDATE / DELETE statements wrote to."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _changed_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _bump_data_versions(session):
+    """Bump data versions for everything the committed transaction wrote.
+
+    Only writes to tables that read endpoints serve (those with a data
+    version family) count for read-your-writes; bookkeeping tables such as
+    dashboard_snapshots or id_counters do not pin reads to the primary.
+    """
+    global _last_write_at
+    families = tables_to_families(session.info.pop("changed_tables", ()))
+    if families:
+        _last_write_at = time.time()
+        request_state = session.info.get("request_state")
+        if request_state is not None:
+            request_state.db_wrote = True
+        bump_versions(*families)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _discard_changed_tables(session):
+    session.info.pop("changed_tables", None)
+
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db():
+def get_db(request: Request):
     """Dependency to get database session."""
     db = SessionLocal()
+    db.info["request_state"] = request.state
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """get_db for read-only endpoints: queries go to the replica if configured."""
+    db = SessionLocal()
+    db.info["request_state"] = request.state
+    if use_replica(request):
+        db.info["replica_bind"] = replica_engine
     try:
         yield db
     finally:
         db.close()
+
+
+class Database:
+    """Database handle for ``async def`` routes, in either engine mode.
+
+    ``await db.run(fn, *args)`` calls a CRUD function as ``fn(session, *args)``:
+    on the threadpool with a regular Session, or through
+    ``AsyncSession.run_sync`` on the async engine, where the same ORM code runs
+    over the async driver without holding a thread while it waits.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn, *args, **kwargs):
+        if AsyncSessionLocal is not None:
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def _database(request: Request, read_only: bool):
+    replica = use_replica(request) if read_only else False
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            session.info["request_state"] = request.state
+            if replica:
+                session.info["replica_bind"] = async_replica_engine.sync_engine
+            yield Database(session)
+        return
+    db = SessionLocal()
+    db.info["request_state"] = request.state
+    if replica:
+        db.info["replica_bind"] = replica_engine
+    try:
+        yield Database(db)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def get_database(request: Request):
+    """Dependency to get a Database handle (see Database)."""
+    async for database in _database(request, read_only=False):
+        yield database
+
+
+async def get_read_database(request: Request):
+    """get_database for read-only endpoints: queries go to the replica if configured."""
+    async for database in _database(request, read_only=True):
+        yield database
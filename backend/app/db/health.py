@@ -0,0 +1,99 @@
+"""Background database health probe.
+
+A daemon thread runs ``SELECT 1`` on the primary engine every
+HEALTH_PROBE_INTERVAL_SECONDS and records the outcome, so health endpoints
+answer from memory instead of each taking a pool connection (and piling up
+when the database stalls).
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db.database import engine
+from app.db.pool import pool_registry
+
+
+class DatabaseProbe:
+    """Periodic connectivity check whose latest result is read by /health."""
+
+    def __init__(self, engine, interval: float = settings.HEALTH_PROBE_INTERVAL_SECONDS):
+        self.engine = engine
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.status = "unknown"
+        self.latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None  # time.time() of the last probe
+        self.consecutive_failures = 0
+
+    def probe(self):
+        """Run one check and record it."""
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as e:
+            with self._lock:
+                self.status = "unreachable"
+                self.latency_ms = round((time.perf_counter() - started) * 1000, 3)
+                self.last_error = f"{e.__class__.__name__}: {e}".splitlines()[0]
+                self.checked_at = time.time()
+                self.consecutive_failures += 1
+            return
+        with self._lock:
+            self.status = "connected"
+            self.latency_ms = round((time.perf_counter() - started) * 1000, 3)
+            self.checked_at = time.time()
+            self.consecutive_failures = 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the probe thread (no-op if it is running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="db-health-probe", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the last result is recent enough to trust (a stalled probe is not)."""
+        return self.checked_at is not None and time.time() - self.checked_at < 3 * self.interval + 5
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "status": self.status if self.is_fresh or self.checked_at is None else "stale",
+                "latency_ms": self.latency_ms,
+                "last_error": self.last_error,
+                "checked_at": datetime.utcfromtimestamp(self.checked_at).isoformat() + "Z" if self.checked_at else None,
+                "consecutive_failures": self.consecutive_failures,
+            }
+
+
+def pool_saturation() -> dict:
+    """Share of each bounded pool's connections (size + overflow) checked out, by engine."""
+    capacity = settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW
+    return {
+        name: round(engine.pool.checkedout() / capacity, 3)
+        for name, (engine, _) in pool_registry.items()
+        if isinstance(engine.pool, QueuePool) and capacity > 0
+    }
+
+
+database_probe = DatabaseProbe(engine)
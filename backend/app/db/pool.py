@@ -0,0 +1,143 @@
+"""Connection pool configuration and metrics.
+
+Engines are created through create_pooled_engine(), which applies the
+DATABASE_POOL_* settings (dropping those the dialect's pool class does not
+take, e.g. sizing for aiosqlite's NullPool) and records pool events in a
+PoolMetrics per engine. Metrics are per worker process and served at
+/metrics/db-pool.
+"""
+import threading
+import time
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import get_cls_kwargs
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Pool event counters and checkout wait times for one engine."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool_class = None  # name of the uninstrumented pool class
+        self.checkout_wait = LatencyStats(buckets=CHECKOUT_WAIT_BUCKETS)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.checkout_timeouts = 0
+
+    def _increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, engine):
+        """Listen to the pool events of a (sync) engine."""
+        event.listen(engine, "connect", lambda *args: self._increment("connections_opened"))
+        event.listen(engine, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self._increment("invalidations")
+        # Pre-ping failures invalidate the connection with a DisconnectionError
+        if isinstance(exception, exc.DisconnectionError):
+            self._increment("pre_ping_failures")
+
+    def snapshot(self, pool) -> dict:
+        stats = {
+            "pool": self.pool_class,
+            "checked_out": self.checkouts - self.checkins,
+            "connections_opened": self.connections_opened,
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "pre_ping_failures": self.pre_ping_failures,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait": self.checkout_wait.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                checked_out=pool.checkedout(),
+                size=pool.size(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                timeout_seconds=pool.timeout(),
+            )
+        return stats
+
+
+def instrumented_pool_class(pool_class, metrics: PoolMetrics):
+    """Subclass of ``pool_class`` that times every checkout into ``metrics``.
+
+    The wait covers queueing for a free connection plus opening or pre-pinging
+    it, i.e. what a request waits for before its first statement.
+    """
+    class InstrumentedPool(pool_class):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                connection = super().connect()
+                # Counted here rather than from "checkout" events, which also
+                # fire for attempts retried after a failed pre-ping
+                metrics._increment("checkouts")
+                return connection
+            except exc.TimeoutError:
+                metrics._increment("checkout_timeouts")
+                raise
+            finally:
+                metrics.checkout_wait.observe(time.perf_counter() - start)
+
+    return InstrumentedPool
+
+
+# create_engine argument -> pool class argument, value
+def _pool_arguments():
+    return {
+        "pool_size": ("pool_size", settings.DATABASE_POOL_SIZE),
+        "max_overflow": ("max_overflow", settings.DATABASE_MAX_OVERFLOW),
+        "pool_timeout": ("timeout", settings.DATABASE_POOL_TIMEOUT),
+        "pool_recycle": ("recycle", settings.DATABASE_POOL_RECYCLE),
+        "pool_use_lifo": ("use_lifo", settings.DATABASE_POOL_USE_LIFO),
+        "pool_pre_ping": ("pre_ping", settings.DATABASE_POOL_PRE_PING),
+    }
+
+
+# Engine name -> (engine, PoolMetrics), in creation order
+pool_registry = {}
+
+
+def create_pooled_engine(name: str, url: str, is_async: bool = False):
+    """Create a sync or async engine with the configured, instrumented pool."""
+    metrics = PoolMetrics(name)
+    parsed = make_url(url)
+    default_pool_class = parsed.get_dialect(_is_async=is_async).get_pool_class(parsed)
+    metrics.pool_class = default_pool_class.__name__
+    pool_class = instrumented_pool_class(default_pool_class, metrics)
+    accepted = get_cls_kwargs(pool_class)
+    options = {
+        argument: value
+        for argument, (pool_argument, value) in _pool_arguments().items()
+        if pool_argument in accepted
+    }
+    if is_async:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        engine = create_async_engine(url, echo=settings.DATABASE_ECHO, poolclass=pool_class, **options)
+        metrics.attach(engine.sync_engine)
+    else:
+        engine = create_engine(url, echo=settings.DATABASE_ECHO, poolclass=pool_class, **options)
+        metrics.attach(engine)
+    pool_registry[name] = (engine, metrics)
+    return engine
+
+
+def pool_stats() -> dict:
+    """Metrics of every engine's pool, keyed by engine name."""
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in pool_registry.items()}
@@ -0,0 +1,58 @@
+"""Per-request SQL statistics (SQL_INSTRUMENTATION).
+
+instrument_engines() adds cursor-execute listeners to every engine; while a
+QueryStats is active in the current context (set per request by
+QueryInstrumentationMiddleware) each statement's count and duration are
+recorded in it. Nothing is hooked unless instrumentation is enabled.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.db.pool import pool_registry
+
+current_query_stats: ContextVar[Optional["QueryStats"]] = ContextVar("current_query_stats", default=None)
+
+
+class QueryStats:
+    """Statements run while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()  # statement text (parameters are placeholders) -> runs
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int):
+        """(statement, runs) for shapes run more than ``threshold`` times, most first."""
+        return [(statement, runs) for statement, runs in self.shapes.most_common() if runs > threshold]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, not the connection: it is discarded with the
+    # statement even when the statement raises and no after event follows
+    if context is not None and current_query_stats.get() is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = getattr(context, "_query_started_at", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument_engines():
+    """Record statements of every engine created so far (idempotent)."""
+    for engine, _ in pool_registry.values():
+        engine = getattr(engine, "sync_engine", engine)
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
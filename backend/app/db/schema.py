@@ -0,0 +1,64 @@
+"""Schema checks at startup.
+
+By default the API creates missing tables when it is imported (and fills a
+rollup table it just added to an existing database). With
+FAST_START the schema is left to init_db.py / ``alembic upgrade head`` and
+startup only compares the database's Alembic revision with the one this code
+expects, once per process and off the request path.
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Alembic head this code expects; update together with each new migration
+SCHEMA_REVISION = "f1a6d2e8c5b3"
+
+# Result of the last check_schema_revision(): None until it has run
+schema_status: Optional[dict] = None
+
+
+def backfill_attendance_rollup(engine) -> bool:
+    """Rebuild the attendance rollup if it is empty while attendance is not.
+
+    That is the state create_all leaves when it adds the rollup table to an
+    existing database; the migration's backfill never runs there. Returns
+    whether a rebuild ran.
+    """
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM attendance_daily_rollup LIMIT 1")).first() is not None:
+            return False
+        if conn.execute(text("SELECT 1 FROM attendance LIMIT 1")).first() is None:
+            return False
+    from app.db.database import SessionLocal
+    from app.crud.attendance_rollup import rebuild_attendance_rollup
+    db = SessionLocal()
+    try:
+        rows = rebuild_attendance_rollup(db)
+    finally:
+        db.close()
+    logger.info("Attendance rollup was empty; rebuilt %d rows", rows)
+    return True
+
+
+def check_schema_revision(engine) -> dict:
+    """Compare the database's alembic_version with SCHEMA_REVISION (logged if stale)."""
+    global schema_status
+    if schema_status is not None:
+        return schema_status
+    try:
+        with engine.connect() as conn:
+            revision = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception as e:
+        logger.warning("Could not read the schema revision (run init_db.py or alembic upgrade head): %s", e)
+        schema_status = {"expected": SCHEMA_REVISION, "current": None, "ok": False}
+        return schema_status
+    if revision != SCHEMA_REVISION:
+        logger.warning(
+            "Database schema is at revision %s, expected %s; run alembic upgrade head",
+            revision, SCHEMA_REVISION
+        )
+    schema_status = {"expected": SCHEMA_REVISION, "current": revision, "ok": revision == SCHEMA_REVISION}
+    return schema_status
@@ -1,20 +1,28 @@
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.serialization import FastJSONResponse
 from app.db.database import Base, engine
+from app.db.schema import backfill_attendance_rollup, check_schema_revision
 from app.routes import auth, employees, attendance, dashboard
 
-# Create database tables
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception as e:
-    print(f"Warning: Could not create database tables on startup. Proceeding... error: {e}")
+# Create database tables (with FAST_START the schema comes from init_db.py /
+# Alembic and is only checked at startup, see app/db/schema.py)
+if not settings.FAST_START:
+    try:
+        Base.metadata.create_all(bind=engine)
+        backfill_attendance_rollup(engine)
+    except Exception as e:
+        print(f"Warning: Could not create database tables on startup. Proceeding... error: {e}")
 
 # Initialize FastAPI app
 app = FastAPI(
     title="HRMS API",
     description="Human Resource Management System API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -24,9 +32,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor of /api/attendance, read by the frontend
+    expose_headers=["X-Next-Cursor"],
 )
 
-from app.routes import auth, employees, attendance, dashboard, metadata
+from app.routes import auth, employees, attendance, dashboard, metadata, metrics, health
+from app.core.middleware import QueryInstrumentationMiddleware, ReadYourWritesMiddleware
+from app.core.compression import CompressionMiddleware
+from app.db.query_stats import instrument_engines
+from app.db.health import database_probe
+
+if settings.DATABASE_REPLICA_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.SQL_INSTRUMENTATION:
+    instrument_engines()
+    app.add_middleware(QueryInstrumentationMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.FAST_START:
+    @app.on_event("startup")
+    def start_schema_check():
+        """Check the schema revision in the background so startup never waits on the database."""
+        threading.Thread(target=check_schema_revision, args=(engine,), daemon=True).start()
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
@@ -34,6 +64,19 @@ app.include_router(employees.router, prefix="/api/employees", tags=["employees"]
 app.include_router(attendance.router, prefix="/api/attendance", tags=["attendance"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
 app.include_router(metadata.router, prefix="/api", tags=["metadata"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(health.router, tags=["health"])
+
+
+@app.on_event("startup")
+def start_database_probe():
+    """Start the background database probe behind the health endpoints."""
+    database_probe.start()
+
+
+@app.on_event("shutdown")
+def stop_database_probe():
+    database_probe.stop()
 
 
 @app.get("/")
@@ -44,24 +87,3 @@ def read_root():
         "version": "1.0.0",
         "docs": "/docs"
     }
-
-
-from sqlalchemy import text
-from app.db.database import SessionLocal
-
-@app.get("/health")
-def health_check():
-    """Health check endpoint with database connectivity test."""
-    db_status = "unknown"
-    try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db_status = "connected"
-        db.close()
-    except Exception as e:
-        db_status = f"unreachable: {str(e)}"
-    
-    return {
-        "status": "healthy" if db_status == "connected" else "degraded",
-        "database": db_status
-    }
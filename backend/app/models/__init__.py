@@ -1,9 +1,12 @@
 """Database models package."""
 from app.models.user import User
 from app.models.employee import Employee, Department, Position
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, AttendanceDailyRollup
 from app.models.leave import LeaveRequest, LeaveType
 from app.models.payroll import Payroll
+from app.models.dashboard import DashboardSnapshot
+from app.models.counter import IdCounter
+from app.models.token import RevokedToken
 
 __all__ = [
     "User",
@@ -11,7 +14,11 @@ __all__ = [
     "Department",
     "Position",
     "Attendance",
+    "AttendanceDailyRollup",
     "LeaveRequest",
     "LeaveType",
     "Payroll",
+    "DashboardSnapshot",
+    "IdCounter",
+    "RevokedToken",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Date, ForeignKey, Text, Time, UniqueConstraint
+from sqlalchemy import Column, String, Integer, DateTime, Date, ForeignKey, Text, Time, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -24,7 +24,19 @@ class Attendance(Base):
     
     __table_args__ = (
         UniqueConstraint('employee_id', 'date', name='unique_employee_date'),
+        Index('ix_attendance_date_id', 'date', 'id'),
     )
 
 
 from sqlalchemy import UniqueConstraint
+
+
+class AttendanceDailyRollup(Base):
+    """Attendance counts per day, department and status, maintained on every write."""
+
+    __tablename__ = "attendance_daily_rollup"
+
+    date = Column(Date, primary_key=True)
+    department_id = Column(Integer, primary_key=True, autoincrement=False, default=0)  # 0 = no department
+    status = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, BigInteger
+
+from app.db.database import Base
+
+
+class IdCounter(Base):
+    """Named counter handing out blocks of sequence numbers.
+
+    Used on databases without native sequences (SQLite); PostgreSQL uses a
+    real sequence instead.
+    """
+
+    __tablename__ = "id_counters"
+
+    name = Column(String(50), primary_key=True)
+    next_value = Column(BigInteger, nullable=False, default=1)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Date, DateTime
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class DashboardSnapshot(Base):
+    """Dashboard headline figures as last computed on a given day."""
+
+    __tablename__ = "dashboard_snapshots"
+
+    date = Column(Date, primary_key=True)
+    total_employees = Column(Integer, nullable=False, default=0)
+    present_today = Column(Integer, nullable=False, default=0)
+    on_leave = Column(Integer, nullable=False, default=0)
+    open_roles = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
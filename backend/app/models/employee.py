@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Date, Text
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Date, Text, Sequence
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -30,6 +30,10 @@ class Position(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+# Employee code numbers (EMP-001, ...) on PostgreSQL; see app/crud/employee_code.py
+employee_code_seq = Sequence("employee_code_seq", metadata=Base.metadata)
+
+
 class Employee(Base):
     """Employee model."""
     
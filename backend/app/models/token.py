@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class RevokedToken(Base):
+    """Refresh token that may no longer be used (rotated or logged out)."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,147 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import io
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date
 from typing import Optional, List
 
-from app.db.database import get_db
-from app.schemas.attendance import AttendanceResponse, MarkAttendancePayload, UpdateAttendancePayload
-from app.models.attendance import Attendance
-from app.models.employee import Employee
-from app.crud.employee import get_all_employees
-from sqlalchemy.orm import joinedload
+from app.db.database import get_db, get_read_db, get_database, get_read_database, Database
+from app.schemas.attendance import (
+    AttendanceResponse, MarkAttendancePayload, UpdateAttendancePayload, BulkAttendanceResponse,
+    AttendanceImportResponse
+)
+from app.crud.attendance import (
+    get_attendance_with_employees, iter_daily_roster, get_daily_roster, bulk_upsert_attendance,
+    get_attendance, mark_attendance as mark_attendance_record,
+    update_attendance as update_attendance_record, get_employee_attendance_history
+)
+from app.crud.attendance_import import import_attendance_csv
+from app.core.constants import BULK_ATTENDANCE_MAX_ROWS
+from app.core.serialization import RowSerializer
 
 router = APIRouter()
 
+# Attendance views return row dicts, serialized without a model per row
+attendance_rows = RowSerializer(List[AttendanceResponse])
+attendance_row = RowSerializer(AttendanceResponse)
+
 @router.get("/", response_model=List[AttendanceResponse])
-def get_attendance_records(
+async def get_attendance_records(
     date: Optional[date] = None,
     startDate: Optional[date] = None,
     endDate: Optional[date] = None,
     employee_id: Optional[int] = None,
     status_: Optional[str] = Query(None, alias="status"),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Database = Depends(get_read_database)
 ):
     if date and not (startDate or endDate or employee_id or status_):
         # Daily view: Return ALL employees merged with their attendance for this date
-        employees, _ = get_all_employees(db, limit=1000)
-        attendance_records = db.query(Attendance).filter(Attendance.date == date).all()
-        attendance_map = {a.employee_id: a for a in attendance_records}
-        
-        results = []
-        for emp in employees:
-            emp_data = emp._asdict()
-            if emp.id in attendance_map:
-                # Get attendance data as dict
-                a = attendance_map[emp.id]
-                a_data = {
-                    "id": a.id,
-                    "employee_id": a.employee_id,
-                    "date": a.date,
-                    "status": a.status,
-                    "check_in_time": a.check_in_time,
-                    "check_out_time": a.check_out_time,
-                    "notes": a.notes,
-                    "created_at": a.created_at,
-                    "updated_at": a.updated_at,
-                    "employee": emp_data
-                }
-                results.append(a_data)
-            else:
-                results.append({
-                    "id": None,
-                    "employee_id": emp.id,
-                    "date": date,
-                    "status": "absent",
-                    "employee": emp_data,
-                    "check_in_time": None,
-                    "check_out_time": None,
-                    "notes": None
-                })
-        return results
+        return attendance_rows.response(await db.run(get_daily_roster, date))
+
+    # Standard filtered view: one joined query, keyset-paginated on (date, id)
+    results, next_cursor = await db.run(
+        get_attendance_with_employees,
+        on_date=date,
+        start_date=startDate,
+        end_date=endDate,
+        employee_id=employee_id,
+        status=status_,
+        cursor=cursor,
+        limit=limit
+    )
+    return attendance_rows.response(results, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+@router.get("/roster")
+def stream_daily_roster(
+    date: date,
+    chunk_size: int = Query(500, ge=1, le=10000),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every employee's attendance for a day as NDJSON (one record per line)."""
+    def generate():
+        for record in iter_daily_roster(db, date, chunk_size=chunk_size):
+            yield attendance_row.dump_json(record) + b"\n"
 
-    # Standard filtered view
-    query = db.query(Attendance)
-    if date:
-        query = query.filter(Attendance.date == date)
-    if startDate:
-        query = query.filter(Attendance.date >= startDate)
-    if endDate:
-        query = query.filter(Attendance.date <= endDate)
-    if employee_id:
-        query = query.filter(Attendance.employee_id == employee_id)
-    if status_:
-        query = query.filter(Attendance.status == status_)
-    
-    records = query.all()
-    results = []
-    for r in records:
-        from app.crud.employee import get_employee_by_id
-        emp = get_employee_by_id(db, r.employee_id)
-        emp_data = emp._asdict() if emp else None
-        
-        a_data = {
-            "id": r.id,
-            "employee_id": r.employee_id,
-            "date": r.date,
-            "status": r.status,
-            "check_in_time": r.check_in_time,
-            "check_out_time": r.check_out_time,
-            "notes": r.notes,
-            "created_at": r.created_at,
-            "updated_at": r.updated_at,
-            "employee": emp_data
-        }
-        results.append(a_data)
-    return results
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/{id}", response_model=AttendanceResponse)
-def get_attendance_by_id(id: int, db: Session = Depends(get_db)):
-    attendance = db.query(Attendance).options(joinedload(Attendance.employee)).filter(Attendance.id == id).first()
+async def get_attendance_by_id(id: int, db: Database = Depends(get_read_database)):
+    attendance = await db.run(get_attendance, id)
     if not attendance:
         raise HTTPException(status_code=404, detail="Attendance not found")
     return attendance
 
 @router.post("/", response_model=AttendanceResponse)
-def mark_attendance(data: MarkAttendancePayload, db: Session = Depends(get_db)):
-    existing = db.query(Attendance).filter(
-        Attendance.employee_id == data.employee_id, 
-        Attendance.date == data.date
-    ).first()
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="Attendance for this date already logged")
-        
-    new_attendance = Attendance(**data.dict())
-    db.add(new_attendance)
-    db.commit()
-    db.refresh(new_attendance)
-    return new_attendance
+async def mark_attendance(data: MarkAttendancePayload, db: Database = Depends(get_database)):
+    return await db.run(mark_attendance_record, data)
+
+@router.post("/bulk", response_model=BulkAttendanceResponse)
+async def mark_attendance_bulk(data: List[MarkAttendancePayload], db: Database = Depends(get_database)):
+    """Mark or update attendance for many employees in a single upsert."""
+    if len(data) > BULK_ATTENDANCE_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_ATTENDANCE_MAX_ROWS} rows can be marked per request"
+        )
+    return await db.run(bulk_upsert_attendance, data)
+
+@router.post("/import", response_model=AttendanceImportResponse)
+def import_attendance(
+    file: UploadFile = File(...),
+    chunk_size: int = Query(5000, ge=100, le=50000),
+    db: Session = Depends(get_db)
+):
+    """Import a time-clock CSV export (employee code, date, check-in/out times)."""
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_attendance_csv(db, lines, chunk_size=chunk_size)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.put("/{id}", response_model=AttendanceResponse)
-def update_attendance(id: int, data: UpdateAttendancePayload, db: Session = Depends(get_db)):
-    attendance = db.query(Attendance).filter(Attendance.id == id).first()
+async def update_attendance(id: int, data: UpdateAttendancePayload, db: Database = Depends(get_database)):
+    attendance = await db.run(update_attendance_record, id, data)
     if not attendance:
         raise HTTPException(status_code=404, detail="Attendance not found")
-        
-    update_data = data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(attendance, key, value)
-        
-    db.add(attendance)
-    db.commit()
-    db.refresh(attendance)
     return attendance
 
 @router.get("/employee/{employeeId}", response_model=List[AttendanceResponse])
-def get_employee_history(
+async def get_employee_history(
     employeeId: int, 
     startDate: date, 
     endDate: date, 
-    db: Session = Depends(get_db)
+    db: Database = Depends(get_read_database)
 ):
-    query = db.query(Attendance).filter(
-        Attendance.employee_id == employeeId,
-        Attendance.date >= startDate,
-        Attendance.date <= endDate
-    )
-    return query.all()
+    return await db.run(get_employee_attendance_history, employeeId, startDate, endDate)
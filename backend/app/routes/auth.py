@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Form
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime, timedelta
 from pydantic import BaseModel
 
-from app.db.database import get_db
+from app.db.database import get_database, Database
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.crud.user import create_user, authenticate_user, get_user_by_email, get_user_by_id
-from app.core.security import create_access_token, create_refresh_token, verify_token, get_current_user
+from app.crud.user import (
+    create_user, get_user_by_email, get_user_by_login, get_user_principal, save_password_hash
+)
+from app.core.security import (
+    create_access_token, create_refresh_token, get_current_user,
+    verify_and_update_password_async, hash_password_async
+)
+from app.crud.token import refresh_revocations, refresh_token_id
 from app.core.config import settings
-from jose import JWTError, jwt
 
 router = APIRouter()
 
@@ -16,10 +20,10 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Database = Depends(get_database)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = get_user_by_email(db, user.email)
+    existing_user = await db.run(get_user_by_email, user.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,18 +31,22 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    db_user = create_user(db, user)
+    db_user = await db.run(create_user, user, await hash_password_async(user.password))
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     email: str = Form(None),
     username: str = Form(None),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: Database = Depends(get_database)
 ):
-    """Login and get access token."""
+    """Login and get access token.
+
+    bcrypt runs on the dedicated password executor, so logins never hold one
+    of the threads shared with other endpoints while hashing.
+    """
     login_id = email or username
     if not login_id:
         raise HTTPException(
@@ -46,23 +54,16 @@ def login(
             detail="Email or username must be provided"
         )
     
-    # Since authentication in our current crud is by email, we'll try email first
-    # If using username, crude but we'll adapt since original expected credentials.email
-    # For now, let's just assume email was passed or login_id is valid for the db lookup
-    # Let's adjust authenticate_user locally or just use email.
-    # The frontend auth.ts says: if (data.email) formData.append('email', data.email)
-    
-    user = authenticate_user(db, login_id, password)
-    if not user:
-        # try checking username instead if email fails
-        from app.crud.user import get_user_by_username
-        from app.core.security import verify_password
-        user = get_user_by_username(db, login_id)
-        if not user or not verify_password(password, user.hashed_password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email/username or password"
-            )
+    # One lookup matching email OR username, then at most one bcrypt verify
+    user = await db.run(get_user_by_login, login_id)
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email/username or password"
+        )
     
     if not user.is_active:
         raise HTTPException(
@@ -76,6 +77,10 @@ def login(
             detail="Access denied. Only administrators can login."
         )
     
+    if new_hash:
+        # Stored hash uses a different bcrypt cost than BCRYPT_ROUNDS
+        await db.run(save_password_hash, user, new_hash)
+    
     # Create tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -97,54 +102,79 @@ def login(
     }
 
 
-@router.post("/refresh", response_model=Token)
-def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
-    """Refresh access token."""
-    token = request.refresh_token
+def decode_refresh_token(token: str) -> dict:
+    """Verify a refresh token's signature and expiry."""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(
             token, settings.JWT_REFRESH_SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
-            
-        user_id = int(user_id_str)
-        user = get_user_by_id(db, user_id)
-        if not user or not user.is_active:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
-            
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email},
-            expires_delta=access_token_expires
-        )
-        refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        new_refresh_token = create_refresh_token(
-            data={"sub": str(user.id)},
-            expires_delta=refresh_token_expires
-        )
-        return {
-            "access_token": access_token,
-            "refresh_token": new_refresh_token,
-            "token_type": "bearer",
-            "user": user
-        }
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    return payload
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(request: RefreshTokenRequest, db: Database = Depends(get_database)):
+    """Refresh access token.
+
+    The refresh token is rotated: the presented one is revoked and a new one
+    issued, so each refresh token can be used only once.
+    """
+    token = request.refresh_token
+    payload = decode_refresh_token(token)
+    
+    user_id = int(payload["sub"])
+    user = await db.run(get_user_principal, user_id)
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+    
+    expires_at = datetime.utcfromtimestamp(payload["exp"])
+    if not await db.run(refresh_revocations.revoke, refresh_token_id(token, payload), user_id, expires_at):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
+        
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": str(user.id), "email": user.email},
+        expires_delta=access_token_expires
+    )
+    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    new_refresh_token = create_refresh_token(
+        data={"sub": str(user.id)},
+        expires_delta=refresh_token_expires
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+        "user": user
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(request: RefreshTokenRequest, db: Database = Depends(get_database)):
+    """Revoke a refresh token."""
+    token = request.refresh_token
+    payload = decode_refresh_token(token)
+    await db.run(
+        refresh_revocations.revoke,
+        refresh_token_id(token, payload), int(payload["sub"]), datetime.utcfromtimestamp(payload["exp"])
+    )
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
+async def get_current_user_info(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Database = Depends(get_database)
 ):
     """Get current user information."""
     user_id = int(current_user["user_id"])
-    user = get_user_by_id(db, user_id)
+    user = await db.run(get_user_principal, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
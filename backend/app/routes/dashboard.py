@@ -1,66 +1,149 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import date, timedelta
-from typing import List
+from typing import List, Optional
 
-from app.db.database import get_db
-from app.schemas.dashboard import DashboardStats, StatItem, TrendDetail, WeeklyAttendanceChartData
-from app.models.employee import Employee, Position
-from app.models.attendance import Attendance
+from app.db.database import get_database, get_read_database, Database, SessionLocal
+from app.schemas.dashboard import DashboardStats, WeeklyAttendanceChartData
+from app.crud.attendance_rollup import get_status_counts
+from app.crud.dashboard import build_dashboard_stats
+from app.core.constants import ATTENDANCE_PRESENT
+from app.core.cache import TTLCache, get_version, add_version_listener
+from app.core.events import ChangeFeed
+from app.core.config import settings
+from app.core.http_cache import conditional_get
 
 router = APIRouter()
 
-@router.get("/stats", response_model=DashboardStats)
-def get_dashboard_stats(db: Session = Depends(get_db)):
-    total_employees = db.query(Employee).count()
-    
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_HEARTBEAT_SECONDS = 15
+
+# Longest range the attendance chart accepts
+MAX_CHART_RANGE_DAYS = 366
+
+# Chart series keyed by (start, end, attendance data version); the TTL bounds
+# staleness from writes this process does not see
+_attendance_chart_cache = TTLCache(ttl=settings.DASHBOARD_CHART_TTL_SECONDS, maxsize=256)
+
+# Stats keyed by (day, employees/attendance/positions data versions)
+_stats_cache = TTLCache(ttl=settings.DASHBOARD_STATS_TTL_SECONDS, maxsize=16)
+
+def get_cached_stats(db: Session) -> DashboardStats:
     today = date.today()
-    present_today = db.query(Attendance).filter(
-        Attendance.date == today, 
-        Attendance.status == 'present'
-    ).count()
-    
-    on_leave = db.query(Attendance).filter(
-        Attendance.date == today, 
-        Attendance.status == 'leave'
-    ).count()
-    
-    open_roles = db.query(Position).count() # simplistic, maybe add status to Position
-    
+    cache_key = (
+        today,
+        get_version("employees"),
+        get_version("attendance"),
+        get_version("positions"),
+    )
+    stats = _stats_cache.get_or_set(cache_key, lambda: build_dashboard_stats(db, today))
     return DashboardStats(
-        totalEmployees=StatItem(
-            value=total_employees,
-            trendDetail=TrendDetail(direction='up', value='+2%')
-        ),
-        presentToday=StatItem(
-            value=present_today,
-            trendDetail=TrendDetail(direction='up', value='+5%')
-        ),
-        onLeave=StatItem(
-            value=on_leave,
-            trendDetail=TrendDetail(direction='down', value='-1%')
-        ),
-        openRoles=StatItem(
-            value=open_roles,
-            trendDetail=TrendDetail(direction='up', value='+1')
-        )
+        totalEmployees=stats["total_employees"],
+        presentToday=stats["present_today"],
+        onLeave=stats["on_leave"],
+        openRoles=stats["open_roles"]
     )
 
-@router.get("/weekly-attendance", response_model=List[WeeklyAttendanceChartData])
-def get_weekly_attendance(db: Session = Depends(get_db)):
-    today = date.today()
-    start_of_week = today - timedelta(days=today.weekday())
-    
-    data = []
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    
-    for i in range(7):
-        current_date = start_of_week + timedelta(days=i)
-        count = db.query(Attendance).filter(
-            Attendance.date == current_date,
-            Attendance.status == 'present'
-        ).count()
-        data.append(WeeklyAttendanceChartData(day=days[i], value=count))
-        
+@router.get(
+    "/stats", response_model=DashboardStats,
+    dependencies=[Depends(conditional_get("employees", "attendance", "positions"))]
+)
+async def get_dashboard_stats(db: Database = Depends(get_database)):
+    """Headline figures; on the primary, since computing them stores today's snapshot.
+
+    Conditional: a 304 may miss another worker's write for up to ETAG_MAX_AGE_SECONDS.
+    """
+    return await db.run(get_cached_stats)
+
+def chart_range(startDate: Optional[date] = None, endDate: Optional[date] = None):
+    """Validated chart range; defaults to the current week."""
+    if startDate is None:
+        today = date.today()
+        startDate = today - timedelta(days=today.weekday())
+    if endDate is None:
+        endDate = startDate + timedelta(days=6)
+    if endDate < startDate or (endDate - startDate).days > MAX_CHART_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"endDate must be on or after startDate and at most {MAX_CHART_RANGE_DAYS} days later"
+        )
+    return startDate, endDate
+
+def get_attendance_chart(db: Session, startDate: date, endDate: date) -> List[WeeklyAttendanceChartData]:
+    cache_key = (startDate, endDate, get_version("attendance"))
+    data = _attendance_chart_cache.get(cache_key)
+    if data is None:
+        present = {
+            row.date: row.count
+            for row in get_status_counts(db, startDate, endDate, status=ATTENDANCE_PRESENT)
+        }
+        data = []
+        for i in range((endDate - startDate).days + 1):
+            current_date = startDate + timedelta(days=i)
+            data.append(WeeklyAttendanceChartData(
+                day=current_date.strftime('%a'),
+                date=current_date,
+                value=present.get(current_date, 0)
+            ))
+        _attendance_chart_cache.set(cache_key, data)
     return data
+
+@router.get(
+    "/weekly-attendance", response_model=List[WeeklyAttendanceChartData],
+    dependencies=[Depends(conditional_get("attendance"))]
+)
+async def get_weekly_attendance(
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+    db: Database = Depends(get_read_database)
+):
+    """Present count per day; defaults to the current week, any range up to a year.
+
+    Conditional: a 304 may miss another worker's write for up to ETAG_MAX_AGE_SECONDS.
+    """
+    startDate, endDate = chart_range(startDate, endDate)
+    return await db.run(get_attendance_chart, startDate, endDate)
+
+
+def _live_dashboard_snapshot() -> dict:
+    """Flat dashboard snapshot pushed to SSE clients (on the primary, see get_dashboard_stats)."""
+    db = SessionLocal()
+    try:
+        snapshot = get_cached_stats(db).model_dump()
+        snapshot["weeklyAttendance"] = [
+            item.model_dump(mode="json") for item in get_attendance_chart(db, *chart_range())
+        ]
+        return snapshot
+    finally:
+        db.close()
+
+
+_dashboard_feed = ChangeFeed(_live_dashboard_snapshot, families={"employees", "attendance", "positions"})
+add_version_listener(_dashboard_feed.notify)
+
+@router.get("/stream")
+async def stream_dashboard(request: Request):
+    """Server-Sent Events feed: a full snapshot first, then only changed fields."""
+    queue = await _dashboard_feed.subscribe()
+
+    async def events():
+        try:
+            yield f"event: snapshot\ndata: {json.dumps(await _dashboard_feed.snapshot())}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    delta = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: delta\ndata: {json.dumps(delta)}\n\n"
+        finally:
+            _dashboard_feed.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,38 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import io
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_db, get_database, get_read_database, Database
 from app.schemas.employee import (
     EmployeeResponse, EmployeeCreate, EmployeeUpdate,
-    DepartmentResponse, PositionResponse, EmployeePaginatedResponse
+    DepartmentResponse, PositionResponse, EmployeePaginatedResponse,
+    BulkEmployeeResponse
 )
 from app.crud.employee import (
     create_employee, get_employee_by_id, get_all_employees,
     update_employee, delete_employee, create_department,
-    get_all_departments, create_position, get_all_positions
+    get_all_departments, create_position, get_all_positions, search_employees
 )
+from app.crud.employee_import import bulk_create_employees, read_employee_csv
+from app.core.constants import BULK_EMPLOYEE_MAX_ROWS, DEFAULT_EMPLOYEE_PASSWORD
+from app.core.security import hash_password_async
+from app.core.serialization import RowSerializer
+from app.core.http_cache import conditional_get
 
 router = APIRouter()
 
+# Pages of up to 1000 rows are serialized without a model per row
+employee_page = RowSerializer(EmployeePaginatedResponse)
+
 
 @router.post("/", response_model=EmployeeResponse)
-def create_new_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
+async def create_new_employee(employee: EmployeeCreate, db: Database = Depends(get_database)):
     """Create a new employee."""
-    db_employee = create_employee(db, employee)
+    hashed_password = await hash_password_async(DEFAULT_EMPLOYEE_PASSWORD)
+    db_employee = await db.run(create_employee, employee, hashed_password)
     if not db_employee:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to create employee"
         )
     # Return full details by calling get_employee_by_id
-    return get_employee_by_id(db, db_employee.id)
+    return await db.run(get_employee_by_id, db_employee.id)
+
+
+@router.post("/bulk", response_model=BulkEmployeeResponse)
+async def create_employees_bulk(request: Request, db: Session = Depends(get_db)):
+    """Onboard many employees from a JSON array or a CSV body / file upload.
+
+    Rows are validated individually; failures are reported per row and do not
+    abort the rest of the batch.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise ValueError("Upload the CSV as a 'file' form field")
+            rows = read_employee_csv(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+        elif content_type.startswith("text/csv"):
+            body = (await request.body()).decode("utf-8-sig")
+            rows = read_employee_csv(io.StringIO(body, newline=""))
+        else:
+            rows = await request.json()
+            if not isinstance(rows, list):
+                raise ValueError("Expected a JSON array of employees")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if len(rows) > BULK_EMPLOYEE_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_EMPLOYEE_MAX_ROWS} employees can be onboarded per request"
+        )
+    return await run_in_threadpool(bulk_create_employees, db, rows)
 
 
-@router.get("/{employee_id}", response_model=EmployeeResponse)
-def get_employee(employee_id: int, db: Session = Depends(get_db)):
-    """Get employee by ID."""
-    employee = get_employee_by_id(db, employee_id)
+@router.get("/search", response_model=List[EmployeeResponse])
+async def search_employee_typeahead(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Database = Depends(get_read_database)
+):
+    """Typeahead search by name, email or employee code, best matches first."""
+    employees, _, _ = await db.run(search_employees, q, limit=limit)
+    return employees
+
+
+@router.get(
+    "/{employee_id}", response_model=EmployeeResponse,
+    dependencies=[Depends(conditional_get("employees", "departments", "positions"))]
+)
+async def get_employee(employee_id: int, db: Database = Depends(get_read_database)):
+    """Get employee by ID.
+
+    Conditional: a 304 may miss another worker's write for up to ETAG_MAX_AGE_SECONDS.
+    """
+    employee = await db.run(get_employee_by_id, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -42,51 +104,62 @@ def get_employee(employee_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=EmployeePaginatedResponse)
-def list_employees(
+async def list_employees(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=1000),
     search: Optional[str] = None,
     department: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|employee_id|date_of_joining)$"),
+    count: str = Query("cached", pattern="^(exact|cached|estimate)$"),
+    db: Database = Depends(get_read_database)
 ):
-    """List all employees with pagination and filtering."""
+    """List all employees with pagination and filtering.
+
+    Pass the returned ``nextCursor`` as ``cursor`` for keyset pagination.
+    """
     skip = (page - 1) * limit
-    employees, total = get_all_employees(
-        db, skip=skip, limit=limit, 
+    employees, total, next_cursor = await db.run(
+        get_all_employees,
+        skip=skip, limit=limit, 
         search=search, 
         department_id=department, 
-        status=status
+        status=status,
+        cursor=cursor,
+        sort=sort,
+        count=count
     )
     
     total_pages = (total + limit - 1) // limit if total > 0 else 0
     
-    return {
+    return employee_page.response({
         "data": employees,
         "total": total,
         "page": page,
         "limit": limit,
-        "totalPages": total_pages
-    }
+        "totalPages": total_pages,
+        "nextCursor": next_cursor
+    })
 
 
 @router.put("/{employee_id}", response_model=EmployeeResponse)
-def update_employee_info(employee_id: int, employee_update: EmployeeUpdate, db: Session = Depends(get_db)):
+async def update_employee_info(employee_id: int, employee_update: EmployeeUpdate, db: Database = Depends(get_database)):
     """Update employee information."""
-    employee = update_employee(db, employee_id, employee_update)
+    employee = await db.run(update_employee, employee_id, employee_update)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
     # Return full details by calling get_employee_by_id
-    return get_employee_by_id(db, employee.id)
+    return await db.run(get_employee_by_id, employee.id)
 
 
 @router.delete("/{employee_id}")
-def delete_employee_record(employee_id: int, db: Session = Depends(get_db)):
+async def delete_employee_record(employee_id: int, db: Database = Depends(get_database)):
     """Delete an employee."""
-    success = delete_employee(db, employee_id)
+    success = await db.run(delete_employee, employee_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,27 +170,27 @@ def delete_employee_record(employee_id: int, db: Session = Depends(get_db)):
 
 # Department endpoints
 @router.post("/departments/", response_model=DepartmentResponse)
-def create_new_department(name: str, description: str = None, db: Session = Depends(get_db)):
+async def create_new_department(name: str, description: str = None, db: Database = Depends(get_database)):
     """Create a new department."""
-    department = create_department(db, name, description)
+    department = await db.run(create_department, name, description)
     return department
 
 
-@router.get("/departments/", response_model=list[DepartmentResponse])
-def list_departments(db: Session = Depends(get_db)):
-    """List all departments."""
-    return get_all_departments(db)
+@router.get("/departments/", response_model=list[DepartmentResponse], dependencies=[Depends(conditional_get("departments"))])
+async def list_departments(db: Database = Depends(get_read_database)):
+    """List all departments (ETag may lag other workers' writes by ETAG_MAX_AGE_SECONDS)."""
+    return await db.run(get_all_departments)
 
 
 # Position endpoints
 @router.post("/positions/", response_model=PositionResponse)
-def create_new_position(title: str, description: str = None, department_id: int = None, db: Session = Depends(get_db)):
+async def create_new_position(title: str, description: str = None, department_id: int = None, db: Database = Depends(get_database)):
     """Create a new position."""
-    position = create_position(db, title, description, department_id)
+    position = await db.run(create_position, title, description, department_id)
     return position
 
 
-@router.get("/positions/", response_model=list[PositionResponse])
-def list_positions(db: Session = Depends(get_db)):
-    """List all positions."""
-    return get_all_positions(db)
+@router.get("/positions/", response_model=list[PositionResponse], dependencies=[Depends(conditional_get("positions"))])
+async def list_positions(db: Database = Depends(get_read_database)):
+    """List all positions (ETag may lag other workers' writes by ETAG_MAX_AGE_SECONDS)."""
+    return await db.run(get_all_positions)
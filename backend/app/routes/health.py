@@ -0,0 +1,53 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.db.health import database_probe, pool_saturation
+from app.db import schema
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health_check():
+    """Health summary from the background database probe; never touches the database."""
+    database_probe.start()
+    database = database_probe.snapshot()
+    return {
+        "status": "healthy" if database["status"] == "connected" else "degraded",
+        "database": database["status"],
+        "probe": database,
+        "pool_saturation": pool_saturation(),
+    }
+
+
+@router.get("/health/live")
+async def liveness():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """Readiness: database reachable per a recent probe, pools not saturated, schema current.
+
+    Returns 503 when not ready so load balancers stop routing to this instance.
+    """
+    database_probe.start()
+    database = database_probe.snapshot()
+    saturation = pool_saturation()
+    reasons = []
+    if database["status"] != "connected":
+        reasons.append(f"database {database['status']}")
+    for name, share in saturation.items():
+        if share >= settings.READINESS_MAX_POOL_SATURATION:
+            reasons.append(f"{name} pool {share:.0%} checked out")
+    if schema.schema_status is not None and not schema.schema_status["ok"]:
+        reasons.append("schema revision mismatch")
+    body = {
+        "status": "not ready" if reasons else "ready",
+        "reasons": reasons,
+        "database": database,
+        "pool_saturation": saturation,
+    }
+    return JSONResponse(body, status_code=503 if reasons else 200)
@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_read_database, Database
 from app.schemas.employee import DepartmentResponse, PositionResponse
 from app.crud.employee import get_all_departments, get_all_positions
+from app.core.http_cache import conditional_get
 
 router = APIRouter()
 
-@router.get("/departments", response_model=List[DepartmentResponse])
-def list_departments(db: Session = Depends(get_db)):
-    """List all departments."""
-    return get_all_departments(db)
+@router.get("/departments", response_model=List[DepartmentResponse], dependencies=[Depends(conditional_get("departments"))])
+async def list_departments(db: Database = Depends(get_read_database)):
+    """List all departments (ETag may lag other workers' writes by ETAG_MAX_AGE_SECONDS)."""
+    return await db.run(get_all_departments)
 
-@router.get("/positions", response_model=List[PositionResponse])
-def list_positions(db: Session = Depends(get_db)):
-    """List all positions."""
-    return get_all_positions(db)
+@router.get("/positions", response_model=List[PositionResponse], dependencies=[Depends(conditional_get("positions"))])
+async def list_positions(db: Database = Depends(get_read_database)):
+    """List all positions (ETag may lag other workers' writes by ETAG_MAX_AGE_SECONDS)."""
+    return await db.run(get_all_positions)
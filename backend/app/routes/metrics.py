@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.core.executors import password_executor
+from app.db.pool import pool_stats
+
+router = APIRouter()
+
+
+@router.get("/password-hashing")
+def password_hashing_metrics():
+    """Password executor load: in-flight calls, rejections, queue wait and hash time."""
+    return password_executor.stats()
+
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    """Connection pools per engine: checked-out and overflow connections, checkout waits, pre-ping failures."""
+    return pool_stats()
@@ -31,3 +31,29 @@ class AttendanceResponse(MarkAttendancePayload):
     class Config:
         from_attributes = True
 
+
+class BulkAttendanceRowResult(BaseModel):
+    index: int
+    employee_id: int
+    date: date
+    outcome: str  # created | updated | rejected
+    detail: Optional[str] = None
+
+
+class BulkAttendanceResponse(BaseModel):
+    created: int
+    updated: int
+    rejected: int
+    results: List[BulkAttendanceRowResult]
+
+
+class AttendanceImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class AttendanceImportResponse(BaseModel):
+    processed: int
+    imported: int
+    rejected: int
+    errors: List[AttendanceImportError]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+import datetime
 
 class TrendDetail(BaseModel):
     direction: str  # 'up' | 'down'
@@ -18,3 +19,4 @@ class DashboardStats(BaseModel):
 class WeeklyAttendanceChartData(BaseModel):
     day: str
     value: int
+    date: Optional[datetime.date] = None
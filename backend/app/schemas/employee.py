@@ -89,3 +89,20 @@ class EmployeePaginatedResponse(BaseModel):
     page: int
     limit: int
     totalPages: int
+    nextCursor: Optional[str] = None
+
+
+class BulkEmployeeRowResult(BaseModel):
+    index: int
+    outcome: str  # created | rejected
+    id: Optional[int] = None
+    employee_id: Optional[str] = None
+    email: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class BulkEmployeeResponse(BaseModel):
+    total: int
+    created: int
+    rejected: int
+    results: List[BulkEmployeeRowResult]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Cold-start import budget for the API.
+
+Imports ``app.main`` with FAST_START=true in ``--runs`` fresh interpreters
+and fails (exit status 1) if the median import time exceeds ``--budget-ms``
+or if a module that should load lazily (``--lazy``) was imported at startup.
+Meant to run in CI so cold-start regressions are caught before deploying.
+
+    python -m benchmarks.cold_start --runs 7 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"ms": elapsed * 1000, "modules": sorted(sys.modules)}))
+"""
+
+# Heavy modules that must not be imported until first use
+DEFAULT_LAZY = ["jose", "passlib", "cryptography"]
+
+
+def measure(runs: int) -> list:
+    env = {**os.environ, "FAST_START": "true"}
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--lazy", nargs="*", default=DEFAULT_LAZY)
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    times = sorted(result["ms"] for result in results)
+    median = statistics.median(times)
+    print(f"import app.main: median {median:.0f} ms, min {times[0]:.0f} ms, max {times[-1]:.0f} ms "
+          f"({args.runs} runs, budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    eager = sorted({
+        module for module in results[0]["modules"]
+        for lazy in args.lazy if module == lazy or module.startswith(lazy + ".")
+    })
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median import time {median:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Concurrent employee creation benchmark.
+
+Runs ``--workers`` threads that each create ``--per-worker`` employees through
+create_employee at the same time, then reports unique-constraint collisions
+and duplicate codes. ``--strategy max`` reproduces the old
+``max(Employee.id) + 1`` code generation for comparison.
+
+    python -m benchmarks.employee_codes --workers 50 --per-worker 2
+
+Run it against a scratch database (DATABASE_URL); it creates real rows.
+"""
+
+import argparse
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import app.crud.employee as employee_crud
+from app.db.database import Base, engine, SessionLocal
+from app.models.employee import Employee
+from app.schemas.employee import EmployeeCreate
+from app.crud.employee_code import format_employee_code
+
+
+class MaxIdCodes:
+    """The previous allocator: next code from max(Employee.id) + 1."""
+
+    def allocate(self, db, count=1):
+        max_id = db.query(func.max(Employee.id)).scalar() or 0
+        return [format_employee_code(max_id + i) for i in range(1, count + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--per-worker", type=int, default=2)
+    parser.add_argument("--strategy", choices=["allocator", "max"], default="allocator")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    if args.strategy == "max":
+        employee_crud.employee_codes = MaxIdCodes()
+
+    run = uuid.uuid4().hex[:8]
+    counts = {"created": 0, "collisions": 0, "errors": 0}
+    counts_lock = threading.Lock()
+    start_gate = threading.Barrier(args.workers)
+
+    def worker(n):
+        db = SessionLocal()
+        try:
+            start_gate.wait()
+            for i in range(args.per_worker):
+                employee = EmployeeCreate(
+                    full_name=f"Bench {run} {n}-{i}",
+                    email=f"bench-{run}-{n}-{i}@example.com",
+                    date_of_joining=date.today(),
+                )
+                try:
+                    employee_crud.create_employee(db, employee)
+                    outcome = "created"
+                except IntegrityError:
+                    db.rollback()
+                    outcome = "collisions"
+                except OperationalError:
+                    # e.g. SQLite "database is locked"
+                    db.rollback()
+                    outcome = "errors"
+                with counts_lock:
+                    counts[outcome] += 1
+        finally:
+            db.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(worker, range(args.workers)))
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        duplicates = db.query(Employee.employee_id).group_by(Employee.employee_id)\
+            .having(func.count() > 1).count()
+    finally:
+        db.close()
+
+    attempts = args.workers * args.per_worker
+    print(f"strategy={args.strategy} workers={args.workers} attempts={attempts}")
+    print(f"created={counts['created']} collisions={counts['collisions']} "
+          f"other_errors={counts['errors']} duplicate_codes={duplicates}")
+    print(f"elapsed={elapsed:.2f}s ({counts['created'] / elapsed:.1f} creates/s)")
+
+
+if __name__ == "__main__":
+    main()
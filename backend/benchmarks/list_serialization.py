@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""List response serialization: response_model path vs RowSerializer.
+
+Serializes synthetic employee pages and attendance lists of each ``--rows``
+size the way FastAPI does for ``response_model`` routes (validate into models,
+jsonable_encoder, JSONResponse) and with app.core.serialization, and reports
+the time per response. No database is needed.
+
+    python -m benchmarks.list_serialization --rows 1000 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, time as clock
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.serialization import FastJSONResponse, RowSerializer
+from app.schemas.attendance import AttendanceResponse
+from app.schemas.employee import EmployeePaginatedResponse
+
+
+def employee_row(n: int) -> dict:
+    now = datetime(2024, 1, 1, 9, 30)
+    return {
+        "id": n, "user_id": n, "employee_id": f"EMP-{n:03d}",
+        "department_id": n % 7 + 1, "position_id": n % 11 + 1, "phone": "555-0100",
+        "date_of_birth": date(1990, 1, 1), "date_of_joining": date(2020, 5, 17), "salary": 55000.0 + n,
+        "address": f"{n} Main Street", "city": "Springfield", "state": "IL", "country": "USA",
+        "postal_code": "62701", "created_at": now, "updated_at": now,
+        "full_name": f"Employee {n}", "email": f"employee{n}@example.com", "username": f"employee{n}",
+        "is_active": True, "department": "ENGINEERING", "position": "Software Engineer",
+    }
+
+
+def attendance_row(n: int) -> dict:
+    now = datetime(2024, 1, 1, 18, 0)
+    return {
+        "id": n, "employee_id": n, "date": date(2024, 1, 1), "status": "present",
+        "check_in_time": clock(9, 0), "check_out_time": clock(18, 0), "notes": None,
+        "created_at": now, "updated_at": now, "employee": employee_row(n),
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    """Median seconds per call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def response_model_path(annotation, content):
+    """What FastAPI does with a response_model route's return value."""
+    field = create_response_field(name="response", type_=annotation)
+
+    def run():
+        data = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=True))
+        return JSONResponse(data).body
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    employee_page = RowSerializer(EmployeePaginatedResponse)
+    attendance_rows = RowSerializer(List[AttendanceResponse])
+
+    print(f"default response class: {FastJSONResponse.__name__}")
+    print(f"{'payload':<12} {'rows':>6} {'response_model ms':>18} {'RowSerializer ms':>17} {'speedup':>8}")
+    for rows in args.rows:
+        page = {
+            "data": [employee_row(n) for n in range(rows)],
+            "total": rows, "page": 1, "limit": rows, "totalPages": 1, "nextCursor": None,
+        }
+        attendance = [attendance_row(n) for n in range(rows)]
+        for name, annotation, content, serializer in (
+            ("employees", EmployeePaginatedResponse, page, employee_page),
+            ("attendance", List[AttendanceResponse], attendance, attendance_rows),
+        ):
+            slow = timed(response_model_path(annotation, content), args.repeat)
+            fast = timed(lambda: serializer.response(content).body, args.repeat)
+            print(f"{name:<12} {rows:>6} {slow * 1000:>18.1f} {fast * 1000:>17.1f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
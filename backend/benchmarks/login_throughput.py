@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Login throughput at different bcrypt costs.
+
+For each cost a throwaway admin user is stored with a hash of that cost and
+``--clients`` threads log in through the API for ``--seconds``. BCRYPT_ROUNDS
+is set to the same cost so no rehash happens during the run.
+
+    python -m benchmarks.login_throughput --costs 10 11 12 13 --clients 16
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core import security
+from app.db.database import Base, engine, SessionLocal
+from app.models.user import User
+
+
+def run_cost(client, cost: int, clients: int, seconds: float) -> dict:
+    security.get_pwd_context().update(bcrypt__rounds=cost)
+    name = f"bench-login-{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    try:
+        db.add(User(
+            email=f"{name}@example.com",
+            username=name,
+            full_name="Login Benchmark",
+            hashed_password=CryptContext(schemes=["bcrypt"], bcrypt__rounds=cost).hash("password123"),
+            role="admin",
+            is_active=True,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(n):
+        # Alternate email and username logins
+        form = {"email": f"{name}@example.com"} if n % 2 else {"username": name}
+        form["password"] = "password123"
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status = client.post("/api/auth/login", data=form).status_code
+            with lock:
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    failures.append(status)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "cost": cost,
+        "logins_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+        "failures": len(failures),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--costs", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    from app.main import app
+
+    print(f"password executor: {settings.PASSWORD_HASH_WORKERS} workers, "
+          f"{os.cpu_count()} CPUs, {args.clients} clients")
+    print(f"{'cost':>4} {'logins/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'failures':>9}")
+    with TestClient(app) as client:
+        for cost in args.costs:
+            result = run_cost(client, cost, args.clients, args.seconds)
+            print(f"{result['cost']:>4} {result['logins_per_s']:>10.1f} {result['p50_ms']:>9.1f} "
+                  f"{result['p99_ms']:>9.1f} {result['failures']:>9}")
+
+
+if __name__ == "__main__":
+    main()
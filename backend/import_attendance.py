@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Import a biometric / time-clock attendance CSV export."""
+
+import argparse
+import sys
+import time
+
+from app.db.database import SessionLocal
+from app.crud.attendance_import import import_attendance_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("csv_file", help="CSV with employee_id (EMP-xxx), date, check_in_time, check_out_time, status, notes")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows written per transaction")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    def report(stats):
+        elapsed = time.perf_counter() - started
+        rate = stats["processed"] / elapsed if elapsed else 0
+        print(
+            f"\rProcessed {stats['processed']:,} rows "
+            f"({stats['imported']:,} imported, {stats['rejected']:,} rejected) "
+            f"- {rate:,.0f} rows/s",
+            end="",
+            flush=True,
+        )
+
+    db = SessionLocal()
+    try:
+        with open(args.csv_file, newline="", encoding="utf-8-sig") as f:
+            stats = import_attendance_csv(db, f, chunk_size=args.chunk_size, progress=report)
+    except ValueError as e:
+        db.rollback()
+        print(f"Error importing attendance: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"\nDone in {time.perf_counter() - started:.1f}s.")
+    for error in stats["errors"]:
+        print(f"  line {error['line']}: {error['detail']}")
+    if stats["rejected"] > len(stats["errors"]):
+        print(f"  ... and {stats['rejected'] - len(stats['errors'])} more rejected rows")
+
+
+if __name__ == "__main__":
+    main()
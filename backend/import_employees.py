@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Onboard employees in bulk from a CSV or JSON file."""
+
+import argparse
+import json
+import sys
+import time
+
+from app.db.database import SessionLocal
+from app.crud.employee_import import bulk_create_employees, read_employee_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "file",
+        help="CSV (full_name, email, date_of_joining, department, position, ...) or a JSON array"
+    )
+    args = parser.parse_args()
+
+    with open(args.file, newline="", encoding="utf-8-sig") as f:
+        if args.file.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = read_employee_csv(f)
+
+    started = time.perf_counter()
+
+    def report(stats):
+        print(f"\rCreated {stats['created']:,} of {stats['total']:,} employees", end="", flush=True)
+
+    db = SessionLocal()
+    try:
+        result = bulk_create_employees(db, rows, progress=report)
+    except Exception as e:
+        db.rollback()
+        print(f"Error importing employees: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"\nDone in {time.perf_counter() - started:.1f}s: "
+          f"{result['created']} created, {result['rejected']} rejected.")
+    for row in result["results"]:
+        if row["outcome"] == "rejected":
+            print(f"  row {row['index'] + 1}: {row['detail']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
 """Initialize database and create default admin user."""
 
-from app.db.database import Base, engine, SessionLocal
+from app.db.database import engine, SessionLocal
 from app.models.user import User
 from app.core.constants import ROLE_ADMIN
 import uuid
 
+# Revision matching the tables the app's create_all has always made
+BASELINE_REVISION = "6e8ad2d97ace"
+
 def init_db():
-    """Create all tables."""
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created.")
+    """Create or migrate the schema by running every Alembic migration up to head.
+
+    Migrations also backfill data (attendance rollup) and add PostgreSQL-only
+    indexes that the models do not declare, so they are run rather than stamped.
+    A database created by the app's create_all (tables but no alembic_version)
+    is first marked as being at the initial schema, then upgraded from there.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import inspect
+    import os
+    cfg = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    tables = inspect(engine).get_table_names()
+    if tables and "alembic_version" not in tables:
+        command.stamp(cfg, BASELINE_REVISION)
+        print("Existing tables found; upgrading from the initial schema.")
+    command.upgrade(cfg, "head")
+    print("Database schema is at the latest revision.")
 
 def create_admin_user():
     """Create default admin user if not exists."""
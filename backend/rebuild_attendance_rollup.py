@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""Recompute the attendance daily rollup table from raw attendance rows."""
+
+from app.db.database import SessionLocal
+from app.crud.attendance_rollup import rebuild_attendance_rollup
+
+
+def main():
+    db = SessionLocal()
+    try:
+        rows = rebuild_attendance_rollup(db)
+        print(f"Attendance rollup rebuilt: {rows} rows.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding attendance rollup: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Tests for bulk employee onboarding (python -m unittest discover tests)."""
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.models.employee import Department
+from app.crud.employee_import import resolve_names
+
+
+class ResolveNamesTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.db = Session(engine)
+        self.db.add(Department(name="ENGINEERING"))
+        self.db.commit()
+        self.engineering_id = self.db.query(Department.id).filter(Department.name == "ENGINEERING").scalar()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_existing_and_new_names_in_one_batch(self):
+        resolved = resolve_names(
+            self.db, Department, Department.name, {"Engineering", "Brand New Dept", "ops"}, lambda name: name.upper()
+        )
+        self.assertEqual(set(resolved), {"engineering", "brand new dept", "ops"})
+        self.assertEqual(resolved["engineering"], self.engineering_id)
+        created = dict(self.db.query(Department.name, Department.id).filter(Department.name != "ENGINEERING").all())
+        self.assertEqual(created, {"BRAND NEW DEPT": resolved["brand new dept"], "OPS": resolved["ops"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
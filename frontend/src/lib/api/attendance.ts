@@ -29,13 +29,25 @@ export interface AttendanceFilters {
     status?: string
 }
 
+// Largest page the attendance list endpoint returns
+const ATTENDANCE_PAGE_SIZE = 1000
+
 class AttendanceService {
     /**
-     * Fetch attendance records with optional filters (date range, specific employee, status)
+     * Fetch attendance records with optional filters (date range, specific employee, status).
+     * Filtered views are paginated; follows the X-Next-Cursor header until every page is loaded.
      */
     static async getAttendanceRecords(filters?: AttendanceFilters): Promise<Attendance[]> {
-        const response = await axiosInstance.get('/api/attendance', { params: filters })
-        return response.data
+        const records: Attendance[] = []
+        let cursor: string | undefined
+        do {
+            const response = await axiosInstance.get('/api/attendance', {
+                params: { ...filters, limit: ATTENDANCE_PAGE_SIZE, cursor }
+            })
+            records.push(...response.data)
+            cursor = response.headers['x-next-cursor']
+        } while (cursor)
+        return records
     }
 
     /**